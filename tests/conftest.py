@@ -0,0 +1,68 @@
+"""Feuilles de match construites à la main et PDF quadrillés générés, partagés par les tests."""
+import io
+
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from volleysheet.structure import CASE_X, VIDE, MatchSheet, TeamSet
+
+def equipe_vide() -> TeamSet:
+    return TeamSet(np.full(6, VIDE), np.full((3, 6), VIDE), np.full((8, 6), VIDE))
+
+@pytest.fixture
+def feuille() -> MatchSheet:
+    # Colonnes Gauche / Droite : A à gauche aux sets 1 et 3, B à gauche au set 2 (A gagne le set 2 25-18)
+    scores = np.full((5, 2), VIDE)
+    scores[:3] = [[25, 20], [18, 25], [22, 25]]
+    return MatchSheet(equipes=('ALPHA', 'BETA'), scores_sets=scores,
+                      sets={n: (equipe_vide(), equipe_vide()) for n in (1, 2, 3)})
+
+@pytest.fixture
+def set_court() -> tuple:
+    """
+    Début de set 6-5 : B sert en premier (première case de A barrée), A marque 3, 2 et 1 points à ses tours
+    et B 2, 2 et 1. Formations 11..16 et 21..26.
+    """
+    scores_a, scores_b = np.full((8, 6), VIDE), np.full((8, 6), VIDE)
+    scores_a[0, :4] = [CASE_X, 3, 5, 6]
+    scores_b[0, :3] = [2, 4, 5]
+    return (TeamSet(np.arange(11, 17), np.full((3, 6), VIDE), scores_a),
+            TeamSet(np.arange(21, 27), np.full((3, 6), VIDE), scores_b))
+
+@pytest.fixture
+def feuille_quadrillee():
+    """Fabrique de PDF paysage A4 avec un tableau quadrillé 3x4 dont le coin haut-gauche est en (haut, gauche)."""
+    def fabriquer(haut: float, gauche: float) -> bytes:
+        figure = Figure(figsize=(842 / 72, 595 / 72))
+        FigureCanvasAgg(figure)
+        ax = figure.add_axes([0, 0, 1, 1])
+        ax.set_xlim(0, 842)
+        ax.set_ylim(595, 0)
+        ax.axis('off')
+        for i in range(4):
+            ax.plot([gauche, gauche + 120], [haut + i * 15] * 2, color='k', lw=0.5)
+        for j in range(5):
+            ax.plot([gauche + j * 30] * 2, [haut, haut + 45], color='k', lw=0.5)
+        tampon = io.BytesIO()
+        figure.savefig(tampon, format='pdf')
+        return tampon.getvalue()
+    return fabriquer
+
+@pytest.fixture
+def feuille_texte():
+    """Fabrique de PDF paysage A4 portant des lignes de texte [(gauche, haut, texte)]."""
+    def fabriquer(lignes: list) -> bytes:
+        figure = Figure(figsize=(842 / 72, 595 / 72))
+        FigureCanvasAgg(figure)
+        ax = figure.add_axes([0, 0, 1, 1])
+        ax.set_xlim(0, 842)
+        ax.set_ylim(595, 0)
+        ax.axis('off')
+        for gauche, haut, texte in lignes:
+            ax.text(gauche, haut, texte, fontsize=8, va='top')
+        tampon = io.BytesIO()
+        figure.savefig(tampon, format='pdf')
+        return tampon.getvalue()
+    return fabriquer
@@ -0,0 +1,48 @@
+"""
+Reconstitution de la feuille de référence : un tableau quadrillé à l'intérieur de chaque zone fixe, à 10 points
+de son coin haut-gauche (la marge laissée autour des tableaux de la feuille), et les mots repères de l'empreinte.
+À remplacer par la page 1 d'une vraie feuille dès qu'un exemplaire anonymisé est disponible.
+
+    python tests/feuilles/generer_reference.py
+"""
+import os
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Cadres [Haut, Gauche, Bas, Droite] des tableaux, chacun contenu dans la zone du même nom et dans aucune autre
+TABLEAUX_REFERENCE = {
+    'set_1_a': [90, 20, 160, 235],
+    'set_1_b': [90, 255, 160, 450],
+    'set_2_b': [90, 470, 160, 580],
+    'set_2_a': [90, 600, 160, 830],
+    'set_3_a': [180, 20, 250, 235],
+    'set_3_b': [180, 255, 250, 390],
+    'set_4_b': [180, 410, 250, 575],
+    'set_4_a': [180, 600, 250, 830],
+    'set_5_a': [290, 20, 350, 130],
+    'set_5_b': [290, 150, 350, 470],
+    'scores': [370, 150, 580, 580],
+}
+MOTS_REPERES = {'LIBEROS': (25, 380), 'Arbitres': (25, 470)}
+
+def generer(chemin: str):
+    figure = Figure(figsize=(842 / 72, 595 / 72))
+    FigureCanvasAgg(figure)
+    ax = figure.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, 842)
+    ax.set_ylim(595, 0)
+    ax.axis('off')
+    for haut, gauche, bas, droite in TABLEAUX_REFERENCE.values():
+        for i in range(4):
+            y = haut + i * (bas - haut) / 3
+            ax.plot([gauche, droite], [y, y], color='k', lw=0.5)
+        for j in range(5):
+            x = gauche + j * (droite - gauche) / 4
+            ax.plot([x, x], [haut, bas], color='k', lw=0.5)
+    for mot, (x, y) in MOTS_REPERES.items():
+        ax.text(x, y, mot, fontsize=8, va='top')
+    figure.savefig(chemin, format='pdf', metadata={'CreationDate': None})
+
+if __name__ == '__main__':
+    generer(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reference.pdf'))
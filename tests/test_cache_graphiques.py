@@ -0,0 +1,132 @@
+"""
+Cache des graphiques rendus : éviction LRU sous le plafond, construction unique d'une clé demandée deux fois et
+préchargement des sets voisins du set affiché.
+"""
+import threading
+import time
+
+import pytest
+
+from volleysheet.cache_graphiques import (etat_cache_graphiques, graphique_en_cache, prechauffer_graphiques,
+                                         vider_cache_graphiques)
+from volleysheet.structure import MatchSheet
+
+@pytest.fixture(autouse=True)
+def cache_vide():
+    vider_cache_graphiques()
+    yield
+    vider_cache_graphiques()
+
+def compteur(graphique):
+    """Construction qui compte ses appels."""
+    def construire():
+        construire.appels += 1
+        return graphique
+    construire.appels = 0
+    return construire
+
+def test_eviction_du_moins_recemment_utilise():
+    image = b'0123456789'
+    constructions = {cle: compteur(image) for cle in 'abc'}
+    graphique_en_cache('a', constructions['a'], taille_max=25)
+    graphique_en_cache('b', constructions['b'], taille_max=25)
+    graphique_en_cache('a', constructions['a'], taille_max=25)  # 'a' redevient le plus récent
+    graphique_en_cache('c', constructions['c'], taille_max=25)  # dépasse 25 octets : 'b' est évincé
+
+    assert etat_cache_graphiques()['taille'] == 20
+    graphique_en_cache('a', constructions['a'], taille_max=25)
+    graphique_en_cache('b', constructions['b'], taille_max=25)
+    assert constructions['a'].appels == 1
+    assert constructions['b'].appels == 2
+
+def test_graphique_vide_ou_trop_gros_non_conserve():
+    vide, gros = compteur(None), compteur(b'x' * 100)
+    for _ in range(2):
+        assert graphique_en_cache('vide', vide, taille_max=50) is None
+        assert graphique_en_cache('gros', gros, taille_max=50) == b'x' * 100
+    assert (vide.appels, gros.appels) == (2, 2)
+    assert etat_cache_graphiques()['entrees'] == 0
+
+def test_cle_en_construction_attendue_une_seule_fois():
+    demarre, libere = threading.Event(), threading.Event()
+
+    def construire_lentement():
+        construire_lentement.appels += 1
+        demarre.set()
+        libere.wait(10)
+        return {'mark': 'rect'}
+    construire_lentement.appels = 0
+
+    resultats = []
+    premier = threading.Thread(target=lambda: resultats.append(graphique_en_cache('duel', construire_lentement)))
+    premier.start()
+    demarre.wait(10)
+    second = threading.Thread(target=lambda: resultats.append(graphique_en_cache('duel', construire_lentement)))
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()  # attend la construction en cours au lieu de la relancer
+    assert etat_cache_graphiques()['en_construction'] == 1
+
+    libere.set()
+    premier.join(10)
+    second.join(10)
+    assert resultats == [{'mark': 'rect'}] * 2
+    assert construire_lentement.appels == 1
+    assert etat_cache_graphiques()['succes'] == 1
+
+def test_echec_de_la_construction_attendue():
+    # L'attente se termine aussi quand la construction échoue : la seconde demande construit elle-même
+    demarre, libere = threading.Event(), threading.Event()
+
+    def echouer():
+        demarre.set()
+        libere.wait(10)
+        raise RuntimeError("rendu impossible")
+
+    erreurs = []
+
+    def demander():
+        try:
+            graphique_en_cache('duel', echouer)
+        except RuntimeError as e:
+            erreurs.append(e)
+
+    premier = threading.Thread(target=demander)
+    premier.start()
+    demarre.wait(10)
+    resultat = []
+    second = threading.Thread(target=lambda: resultat.append(graphique_en_cache('duel', lambda: b'png')))
+    second.start()
+    libere.set()
+    premier.join(10)
+    second.join(10)
+    assert len(erreurs) == 1 and resultat == [b'png']
+
+def test_sets_voisins(feuille: MatchSheet):
+    assert feuille.sets_voisins(1) == [2]
+    assert feuille.sets_voisins(2) == [3, 1]  # le suivant d'abord
+    assert feuille.sets_voisins(3) == [2]
+
+def test_voisins_prechauffes_en_arriere_plan(feuille: MatchSheet):
+    ordre = []
+
+    def tache(set_num: int, type_graphique: str):
+        def construire():
+            ordre.append((set_num, type_graphique))
+            return f"{type_graphique} {set_num}".encode()
+        return (set_num, type_graphique), construire
+
+    # Le set 3 est déjà en cache : seul le set 1 reste à préparer quand le set 2 s'affiche
+    graphique_en_cache(*tache(3, 'duel'))
+    graphique_en_cache(*tache(3, 'rotations'))
+    ordre.clear()
+    prechauffer_graphiques([tache(n, t) for n in feuille.sets_voisins(2) for t in ('duel', 'rotations')])
+    for _ in range(100):
+        if etat_cache_graphiques()['entrees'] == 4:
+            break
+        time.sleep(0.05)
+    assert ordre == [(1, 'duel'), (1, 'rotations')]
+
+    # Servis depuis le cache quand la page les demande
+    assert graphique_en_cache(*tache(1, 'duel')) == b'duel 1'
+    assert ordre == [(1, 'duel'), (1, 'rotations')]
@@ -0,0 +1,32 @@
+"""Chronologie point par point reconstruite depuis les grilles de score d'un début de set déroulé à la main."""
+import numpy as np
+
+from volleysheet.chronologie import DTYPE_CHRONOLOGIE, bilan_rotations, construire_chronologie
+from volleysheet.structure import VIDE, TeamSet
+
+def test_deroule_point_par_point(set_court):
+    chronologie = construire_chronologie(*set_court)
+    assert chronologie.dtype == DTYPE_CHRONOLOGIE
+    assert chronologie['point'].tolist() == list(range(11))
+    # B sert et marque 2 ; A gagne le side-out puis 2 au service (serveur en II) ; et ainsi de suite
+    assert chronologie['marqueur'].tolist() == [1, 1, 0, 0, 0, 1, 1, 0, 0, 1, 0]
+    assert chronologie['service'].tolist() == [1, 1, 1, 0, 0, 0, 1, 1, 0, 0, 1]
+    assert chronologie['serveur'].tolist() == [21, 21, 21, 12, 12, 12, 22, 22, 13, 13, 23]
+    assert chronologie['score_a'].tolist() == [0, 0, 1, 2, 3, 3, 3, 4, 5, 5, 6]
+    assert chronologie['score_b'].tolist() == [1, 2, 2, 2, 2, 3, 4, 4, 4, 5, 5]
+    # Une équipe tourne quand elle récupère le service : le side-out se joue encore dans l'ancienne rotation
+    assert chronologie['rotation_a'].tolist() == [0, 0, 0, 1, 1, 1, 1, 1, 2, 2, 2]
+    assert chronologie['rotation_b'].tolist() == [0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2]
+    assert chronologie['tour'].tolist() == [1, 1, 2, 2, 2, 3, 3, 4, 4, 5, 6]
+
+def test_bilan_par_rotation(set_court):
+    chronologie = construire_chronologie(*set_court)
+    bilan_a = bilan_rotations(chronologie, 0)
+    assert bilan_a['gagnes'].tolist() == [1, 3, 2, 0, 0, 0]
+    assert bilan_a['perdus'].tolist() == [2, 2, 1, 0, 0, 0]
+    assert bilan_a['differentiel'].tolist() == [-1, 1, 1, 0, 0, 0]
+
+def test_set_vide():
+    vide = TeamSet(np.full(6, VIDE), np.full((3, 6), VIDE), np.full((8, 6), VIDE))
+    chronologie = construire_chronologie(vide, vide)
+    assert chronologie.size == 0 and chronologie.dtype == DTYPE_CHRONOLOGIE
@@ -0,0 +1,42 @@
+"""Séries, side-out / break et indice de dynamique sur le début de set de la fixture set_court."""
+import math
+
+from volleysheet.chronologie import construire_chronologie
+from volleysheet.dynamique import bilan_dynamique
+
+# Points marqués : B B A A A B B A A B A
+
+def test_series_de_points(set_court):
+    bilan = bilan_dynamique(construire_chronologie(*set_court))
+    series = bilan['series']
+    assert series['equipe'].tolist() == [1, 0, 1, 0, 1, 0]
+    assert series['longueur'].tolist() == [2, 3, 2, 2, 1, 1]
+    assert series['premier_point'].tolist() == [0, 2, 5, 7, 9, 10]
+    assert list(zip(series['debut_a'].tolist(), series['debut_b'].tolist()))[:3] == [(0, 0), (0, 2), (3, 2)]
+    assert list(zip(series['fin_a'].tolist(), series['fin_b'].tolist()))[-1] == (6, 5)
+    assert bilan['plus_longues'] == (3, 2)
+
+    # Seule la série de 3 de A compte comme trou, subi par B en rotation I
+    trous_a, trous_b = bilan['trous']
+    assert trous_a['series'].sum() == 0
+    assert trous_b['series'].tolist() == [1, 0, 0, 0, 0, 0]
+    assert trous_b['points'].tolist() == [3, 0, 0, 0, 0, 0]
+
+def test_side_out_et_break(set_court):
+    sob_a, sob_b = bilan_dynamique(construire_chronologie(*set_court))['side_out_break']
+    assert (sob_a['receptions'], sob_a['side_out'], sob_a['services'], sob_a['break']) == (6, 3, 5, 3)
+    assert (sob_a['pct_side_out'], sob_a['pct_break']) == (50.0, 60.0)
+    assert (sob_b['receptions'], sob_b['side_out'], sob_b['services'], sob_b['break']) == (5, 2, 6, 3)
+    assert (sob_b['pct_side_out'], sob_b['pct_break']) == (40.0, 50.0)
+
+def test_indice_dynamique(set_court):
+    indice = bilan_dynamique(construire_chronologie(*set_court), fenetre=5)['indice']
+    # Solde des 5 derniers points du point de vue de A (fenêtre tronquée sur les premiers points)
+    assert indice.tolist() == [-1, -2, -1, 0, 1, 1, 1, 1, 1, -1, 1]
+
+def test_set_sans_chronologie():
+    bilan = bilan_dynamique(None)
+    assert bilan['plus_longues'] == (0, 0)
+    assert bilan['indice'].size == 0
+    sob_a, _ = bilan['side_out_break']
+    assert sob_a['receptions'] == 0 and math.isnan(sob_a['pct_side_out']) and math.isnan(sob_a['pct_break'])
@@ -0,0 +1,46 @@
+"""Exports : les scores des sets sont attribués à la bonne équipe, quel que soit son côté sur la feuille."""
+import re
+import resource
+import zipfile
+
+import pandas as pd
+
+from volleysheet.export import classeur_matchs, ecrire_classeur_matchs, tables_parquet
+from volleysheet.structure import MatchSheet
+
+def test_scores_parquet_par_equipe(feuille: MatchSheet):
+    scores = tables_parquet({'feuille': feuille, 'date': '2026-10-18'}, 'abc')['scores'].to_pylist()
+    lignes = {(ligne['set'], ligne['equipe']): (ligne['points'], ligne['points_adverses'], ligne['gagne'])
+              for ligne in scores}
+    assert lignes == {
+        (1, 'ALPHA'): (25, 20, True), (1, 'BETA'): (20, 25, False),
+        (2, 'ALPHA'): (25, 18, True), (2, 'BETA'): (18, 25, False),
+        (3, 'ALPHA'): (22, 25, False), (3, 'BETA'): (25, 22, True),
+    }
+
+def test_sommaire_classeur_par_equipe(feuille: MatchSheet, tmp_path):
+    chemin = tmp_path / 'matchs.xlsx'
+    chemin.write_bytes(classeur_matchs([{'feuille': feuille, 'equipes': feuille.equipes, 'sets': {}}]))
+    with zipfile.ZipFile(chemin) as archive:
+        sommaire = archive.read('xl/worksheets/sheet1.xml').decode()
+    # Colonnes E / F de l'onglet 'Matchs' : sets gagnés par A et par B
+    cases = dict(re.findall(r'<c r="([EF]2)"[^>]*><v>([^<]*)</v>', sommaire))
+    assert cases == {'E2': '2', 'F2': '1'}
+
+def test_gros_lot_sous_limite_de_descripteurs(feuille: MatchSheet, tmp_path):
+    # 100 matchs de 3 sets (300 onglets de sets) avec au plus 64 fichiers ouverts : le classeur est découpé
+    tableau = pd.DataFrame([[''] * 6] * 12, columns=[f'C{i}' for i in range(6)])
+    matchs = ({'feuille': feuille, 'equipes': feuille.equipes, 'date': '2026-10-18',
+               'sets': {n: {'a': tableau, 'b': tableau} for n in (1, 2, 3)}} for _ in range(100))
+    limite_douce, limite_dure = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (64, limite_dure))
+    try:
+        fichiers = ecrire_classeur_matchs(matchs, str(tmp_path / 'lot.xlsx'), onglets_max=30)
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limite_douce, limite_dure))
+
+    assert fichiers == [str(tmp_path / 'lot.xlsx')] + [str(tmp_path / f'lot_{n}.xlsx') for n in range(2, 11)]
+    with zipfile.ZipFile(fichiers[-1]) as archive:
+        classeur = archive.read('xl/workbook.xml').decode()
+    # Dernier fichier : matchs 91 à 100, numérotés comme dans le lot
+    assert 'name="M91 Set 1"' in classeur and 'name="M100 Set 3"' in classeur
@@ -0,0 +1,126 @@
+"""
+Affectation des tables tabula aux zones de la feuille (sans JVM : la lecture tabula est simulée), calibration
+des gabarits sur la feuille de référence (tests/feuilles/reference.pdf) et sur des feuilles quadrillées générées,
+et lecture des effectifs.
+"""
+import os
+
+import pdfplumber
+import pytest
+
+from volleysheet import extraction
+from volleysheet.extraction import (ORIGINE_REFERENCE, PARAMETRES_LATTICE_PDFPLUMBER, ZONES_EXTRACTION,
+                                    _extraire_lignes_tabula, _groupes_zones, _zone_contient, _zones_chevauchent,
+                                    calibrer_gabarit, extraire_effectifs)
+
+FEUILLE_REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feuilles', 'reference.pdf')
+
+def table(haut, gauche, bas, droite, texte='x'):
+    return {'top': haut, 'left': gauche, 'bottom': bas, 'right': droite, 'data': [[{'text': texte}]]}
+
+def simuler_tabula(monkeypatch, tables_par_zone: dict) -> list:
+    """Remplace tabula : chaque zone demandée renvoie ses tables, dans l'ordre des zones ; renvoie les appels."""
+    appels = []
+
+    def lire(pdf_source, area, **options):
+        appels.append(area)
+        return [t for zone in area for nom, z in ZONES_EXTRACTION.items() if z == zone
+                for t in tables_par_zone.get(nom, [])]
+
+    monkeypatch.setattr(extraction, 'lire_pdf_tabula', lire)
+    return appels
+
+def test_groupes_sans_chevauchement():
+    groupes = _groupes_zones(ZONES_EXTRACTION)
+    assert sorted(nom for groupe in groupes for nom in groupe) == sorted(ZONES_EXTRACTION)
+    for groupe in groupes:
+        zones = list(groupe.values())
+        assert not any(_zones_chevauchent(z1, z2) for i, z1 in enumerate(zones) for z2 in zones[i + 1:])
+    assert len(groupes) == 3
+
+def test_chaque_zone_recoit_sa_table(monkeypatch):
+    appels = simuler_tabula(monkeypatch, {nom: [table(*zone, texte=nom)] for nom, zone in ZONES_EXTRACTION.items()})
+    lignes = _extraire_lignes_tabula(b'', ZONES_EXTRACTION)
+    assert lignes == {nom: [[nom]] for nom in ZONES_EXTRACTION}
+    assert len(appels) == 3
+
+def test_zones_qui_se_chevauchent_gardent_leurs_lignes(monkeypatch):
+    # Le tableau des scores renvoie aussi une table dans sa bande commune avec set_5_b (lignes lues par
+    # process_and_structure_scores) ; set_3_b ne renvoie rien et set_4_b une table rognée dans la bande commune
+    simuler_tabula(monkeypatch, {
+        'scores': [table(302, 142, 358, 478, texte='scores haut'), table(360, 140, 840, 595, texte='scores bas')],
+        'set_5_b': [table(282, 142, 358, 478, texte='set_5_b')],
+        'set_4_b': [table(172, 402, 258, 468, texte='set_4_b')],
+        'set_4_a': [table(*ZONES_EXTRACTION['set_4_a'], texte='set_4_a')],
+    })
+    lignes = _extraire_lignes_tabula(b'', ZONES_EXTRACTION)
+    assert lignes['scores'] == [['scores haut'], ['scores bas']]
+    assert lignes['set_5_b'] == [['set_5_b']]
+    assert lignes['set_3_b'] == []
+    assert lignes['set_4_b'] == [['set_4_b']]
+    assert lignes['set_4_a'] == [['set_4_a']]
+
+def test_table_hors_zones_ignoree(monkeypatch):
+    simuler_tabula(monkeypatch, {'scores': [table(10, 600, 50, 800)]})
+    assert all(lignes == [] for lignes in _extraire_lignes_tabula(b'', ZONES_EXTRACTION).values())
+
+def test_zones_fixes_couvrent_les_tableaux_de_reference():
+    # Chaque tableau de la feuille de référence est dans une seule zone, et chaque zone a son tableau
+    with pdfplumber.open(FEUILLE_REFERENCE) as pdf:
+        tables = pdf.pages[0].find_tables(PARAMETRES_LATTICE_PDFPLUMBER)
+        cadres = [{'top': t.bbox[1], 'left': t.bbox[0], 'bottom': t.bbox[3], 'right': t.bbox[2]} for t in tables]
+    zones_par_table = [[nom for nom, zone in ZONES_EXTRACTION.items() if _zone_contient(zone, c)] for c in cadres]
+    assert all(len(zones) == 1 for zones in zones_par_table)
+    assert sorted(zones[0] for zones in zones_par_table) == sorted(ZONES_EXTRACTION)
+
+def test_calibration_feuille_de_reference():
+    empreinte, gabarit = calibrer_gabarit(FEUILLE_REFERENCE, 'Référence')
+    assert empreinte.startswith('840x595|LIBEROS@')
+    assert gabarit['origine'] == ORIGINE_REFERENCE
+    assert gabarit['zones'] == ZONES_EXTRACTION
+
+def test_calibration_feuille_decalee(feuille_quadrillee):
+    # Même une première calibration se mesure par rapport à l'origine de référence
+    _, gabarit = calibrer_gabarit(feuille_quadrillee(ORIGINE_REFERENCE[0] + 8, ORIGINE_REFERENCE[1] + 12), 'Décalée')
+    haut, gauche, bas, droite = ZONES_EXTRACTION['set_1_a']
+    assert gabarit['zones']['set_1_a'] == [haut + 8, gauche + 12, bas + 8, droite + 12]
+
+def test_backend_tabula_non_configure(monkeypatch):
+    monkeypatch.setattr(extraction, '_mode_backend', None)
+    monkeypatch.setattr(extraction, '_backend_actif', None)
+    with pytest.raises(RuntimeError):
+        extraction.lire_pdf_tabula(b'', pages=1)
+
+def test_backend_tabula_configure_respecte(monkeypatch):
+    import tabula
+    monkeypatch.setattr(extraction, '_mode_backend', None)
+    monkeypatch.setattr(extraction, '_backend_actif', None)
+    options_lues = {}
+    monkeypatch.setattr(tabula, 'read_pdf', lambda source, **options: options_lues.update(options) or [])
+    extraction.configurer_backend_tabula('subprocess')
+    extraction.lire_pdf_tabula(b'', pages=1)
+    assert options_lues['force_subprocess'] is True
+    with pytest.raises(ValueError):
+        extraction.configurer_backend_tabula('jvm')
+
+def test_effectifs_attribues_selon_la_colonne(feuille_texte):
+    pdf = feuille_texte([
+        (30, 100, '04 DUPONT LEA 123456'), (450, 100, '07 MARTIN ZOE 654321'), (30, 115, '11 DURAND EVA 223344'),
+        (30, 200, 'LIBEROS'), (30, 215, '02 PETIT ANA 334455'), (450, 215, '09 ROUX MIA 445566'),
+        (30, 300, 'Arbitres'), (30, 315, 'EA LEROY PAUL 556677'), (450, 315, 'EB MOREAU LUC 667788'),
+    ])
+    effectifs = extraire_effectifs(pdf)
+    joueurs = effectifs['joueurs'].set_index('Licence')
+    assert joueurs['Equipe'].to_dict() == {'123456': 'A', '654321': 'B', '223344': 'A'}
+    assert joueurs.loc['654321', 'Identite'] == 'MARTIN ZOE'
+    assert effectifs['liberos'][['Numero', 'Equipe']].values.tolist() == [['02', 'A'], ['09', 'B']]
+    assert effectifs['staff'][['Code', 'Equipe']].values.tolist() == [['EA', 'A'], ['EB', 'B']]
+
+def test_effectifs_une_seule_colonne(feuille_texte):
+    # Colonnes trop proches pour distinguer les équipes : côté inconnu plutôt qu'une attribution au hasard
+    pdf = feuille_texte([(30, 100, '04 DUPONT LEA 123456'), (60, 115, '07 MARTIN ZOE 654321'),
+                         (30, 200, 'LIBEROS'), (30, 300, 'Arbitres')])
+    effectifs = extraire_effectifs(pdf)
+    assert effectifs['joueurs']['Equipe'].isna().all()
+    assert len(effectifs['joueurs']) == 2
+    assert effectifs['liberos'].empty and effectifs['staff'].empty
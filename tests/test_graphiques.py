@@ -0,0 +1,47 @@
+"""
+Non-régression du graphique d'évolution du score : le tracé depuis les tableaux précalculés doit reproduire,
+pixel pour pixel, les images de référence (tests/images) rendues par le tracé d'origine sur les mêmes sets.
+"""
+import io
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from volleysheet.chronologie import construire_chronologie
+from volleysheet.graphiques import tracer_duel_equipes
+from volleysheet.structure import VIDE, TeamSet
+
+DOSSIER_IMAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+DPI_COMPARAISON = 66
+
+# Sets connus : (formation, lignes de scores R4 à R11 remplies) de l'équipe de gauche puis de droite
+SETS_CONNUS = {
+    1: (([8, 18, 5, 12, 15, 10], [[0, 2, 5, 6, 8, 9], [10, 12, 14, 19, 21, -1]]),
+        ([16, 3, 1, 19, 5, 9], [[-2, 2, 3, 9, 15, 18], [19, 20, 21, 23, 24, 25]])),
+    2: (([5, 13, 18, 15, 14, 9], [[1, 2, 5, 6, 10, 12], [15, 18, 19, 20, -1, -1]]),
+        ([13, 18, 4, 9, 7, 11], [[-2, 5, 8, 10, 13, 14], [16, 17, 18, 24, 25, -1]])),
+    3: (([18, 8, 2, 15, 14, 13], [[-2, 2, 4, 5, 6, 9], [10, 15, 18, 19, 20, 21], [25, -1, -1, -1, -1, -1]]),
+        ([17, 10, 11, 8, 14, 2], [[0, 1, 2, 3, 5, 7], [11, 15, 16, 18, 22, 23]])),
+}
+
+def equipe(formation: list, lignes: list) -> TeamSet:
+    scores = np.full((8, 6), VIDE, dtype=np.int16)
+    scores[:len(lignes)] = lignes
+    return TeamSet(np.array(formation, dtype=np.int16), np.full((3, 6), VIDE, dtype=np.int16), scores)
+
+def pixels(figure) -> np.ndarray:
+    tampon = io.BytesIO()
+    figure.savefig(tampon, format='png', dpi=DPI_COMPARAISON)
+    return np.asarray(Image.open(tampon))
+
+@pytest.mark.parametrize('set_num', sorted(SETS_CONNUS))
+def test_duel_identique_a_la_reference(set_num: int):
+    gauche, droite = (equipe(*e) for e in SETS_CONNUS[set_num])
+    figure = tracer_duel_equipes(gauche, droite, f"Évolution Set {set_num}", 'ALPHA', 'BETA',
+                                 chronologie=construire_chronologie(gauche, droite))
+    obtenu = pixels(figure)
+    attendu = np.asarray(Image.open(os.path.join(DOSSIER_IMAGES, f'duel_set_{set_num}.png')))
+    assert obtenu.shape == attendu.shape
+    assert not (obtenu != attendu).any(), f"{int((obtenu != attendu).any(axis=2).sum())} pixels différents"
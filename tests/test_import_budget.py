@@ -0,0 +1,54 @@
+"""
+Démarrage à froid de la page d'accueil, dans un interpréteur neuf : les bibliothèques lourdes attendent le premier
+PDF, graphique ou export. Le temps d'import, qui dépend de la machine, ne se mesure qu'à la demande :
+`pytest -m chrono`.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules importés par la page d'accueil, et bibliothèques qui doivent attendre le premier PDF, graphique ou export
+MODULES_PAGE_ACCUEIL = ['volleysheet.export', 'volleysheet.extraction', 'volleysheet.pipeline', 'volleysheet.saison',
+                        'volleysheet.stockage', 'volleysheet.structure', 'volleysheet.vega',
+                        'volleysheet.cache_graphiques']
+MODULES_DIFFERES = ['tabula', 'pdfplumber', 'matplotlib', 'xlsxwriter', 'pyarrow']
+BUDGET_IMPORT_MS = 1000  # mesuré autour de 500 ms (pandas et numpy compris) : marge x2 pour les machines lentes
+
+def modules_charges(code: str) -> set:
+    """Exécute `code` dans un interpréteur neuf et renvoie les modules chargés à la fin."""
+    code += "\nimport json, sys; print(json.dumps(sorted(sys.modules)))"
+    sortie = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=RACINE).stdout
+    return set(json.loads(sortie.splitlines()[-1]))
+
+def test_page_accueil_sans_bibliotheques_lourdes():
+    # pandas importe lui-même pyarrow quand il est installé : seul ce que la page ajoute au socle compte
+    socle = modules_charges("import pandas, streamlit")
+    page = modules_charges("from streamlit.testing.v1 import AppTest\n"
+                           "AppTest.from_file('test1.py', default_timeout=120).run()")
+    assert 'volleysheet.stockage' in page
+    assert [nom for nom in MODULES_DIFFERES if nom in page - socle] == []
+
+def mesurer_imports(modules: list) -> dict:
+    """Importe les modules dans un interpréteur neuf avec `-X importtime` ; renvoie {module: durée propre (ms)}."""
+    sortie = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + ', '.join(modules)],
+                            capture_output=True, text=True, check=True, cwd=RACINE).stderr
+    durees = {}
+    for ligne in sortie.splitlines():
+        if not ligne.startswith('import time:') or 'self [us]' in ligne:
+            continue
+        propre, _, nom = ligne[len('import time:'):].split('|')
+        durees[nom.strip()] = int(propre) / 1000
+    return durees
+
+@pytest.mark.chrono
+def test_budget_import_page_accueil():
+    durees = mesurer_imports(MODULES_PAGE_ACCUEIL)
+    total = sum(durees.values())
+    plus_lents = sorted(durees.items(), key=lambda item: -item[1])[:10]
+    assert total <= BUDGET_IMPORT_MS, f"import en {total:.0f} ms ; modules les plus lents : {plus_lents}"
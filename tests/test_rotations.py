@@ -0,0 +1,53 @@
+"""Statistiques des rotations sur un set calculé à la main, seul puis empilé avec les autres sets du match."""
+import numpy as np
+
+from volleysheet.rotations import calculer_stats_rotations, passages_rotation, stats_rotations, stats_rotations_match
+from volleysheet.structure import VIDE, MatchSheet, TeamSet
+
+def grille_scores(*lignes) -> np.ndarray:
+    grille = np.full((8, 6), VIDE)
+    for i, ligne in enumerate(lignes):
+        grille[i, :len(ligne)] = ligne
+    return grille
+
+# Set gagné 25-23 par A : en serpentin, A marque 3, 2, 3, 4, 3, 3 puis 3, 4 à ses huit tours de service
+# et B 2, 4, 3, 2, 3, 3 puis 3, 3
+SCORES_A = grille_scores([3, 5, 8, 12, 15, 18], [21, 25])
+SCORES_B = grille_scores([2, 6, 9, 11, 14, 17], [20, 23])
+
+def equipe(scores: np.ndarray) -> TeamSet:
+    return TeamSet(np.arange(1, 7), np.full((3, 6), VIDE), scores)
+
+def test_set_calcule_a_la_main():
+    stats = calculer_stats_rotations(SCORES_A, SCORES_B)
+    assert stats['joues'][0].all() and stats['joues'][1].tolist() == [True, True, False, False, False, False]
+    assert not stats['joues'][2:].any()
+    assert stats['marques'][:2].tolist() == [[3, 2, 3, 4, 3, 3], [3, 4, 0, 0, 0, 0]]
+    # Les passages non joués par A ne comptent pas les points de B
+    assert stats['encaisses'][:2].tolist() == [[2, 4, 3, 2, 3, 3], [3, 3, 0, 0, 0, 0]]
+    assert stats['total_marques'].tolist() == [6, 6, 3, 4, 3, 3]
+    assert stats['total_encaisses'].tolist() == [5, 7, 3, 2, 3, 3]
+    assert stats['differentiel'].tolist() == [1, -1, 0, 2, 0, 0]
+    assert passages_rotation(stats, 1) == ([2, 4], [4, 3])
+
+def test_colonne_interrompue_par_une_case_vide():
+    # Une case vide arrête la rotation : les scores écrits en dessous ne sont pas des passages joués
+    scores = grille_scores([3, 5, 8, 12, 15, 18], [VIDE, 25], [30])
+    stats = calculer_stats_rotations(scores, SCORES_B)
+    assert stats['joues'][:, 0].tolist() == [True] + [False] * 7
+    assert stats['total_marques'][0] == 3
+
+def test_match_empile_comme_sets_separes():
+    sets = {1: (equipe(SCORES_A), equipe(SCORES_B)), 2: (equipe(SCORES_B), equipe(SCORES_A))}
+    scores = np.full((5, 2), VIDE)
+    scores[:2] = [[25, 23], [25, 23]]
+    feuille = MatchSheet(equipes=('ALPHA', 'BETA'), scores_sets=scores, sets=sets)
+
+    par_set = stats_rotations_match(feuille)
+    assert sorted(par_set) == [1, 2]
+    for n, (a, b) in sets.items():
+        for cote, (equipe_set, adversaire) in zip('ab', ((a, b), (b, a))):
+            attendu = stats_rotations(equipe_set, adversaire)
+            for cle, valeurs in attendu.items():
+                assert np.array_equal(par_set[n][cote][cle], valeurs), (n, cote, cle)
+    assert par_set[2]['b']['total_marques'].tolist() == [6, 6, 3, 4, 3, 3]
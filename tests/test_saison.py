@@ -0,0 +1,14 @@
+"""Base de saison : les scores du récapitulatif (colonnes Gauche / Droite) sont rangés par équipe."""
+from volleysheet.saison import ingerer_match, ouvrir_saison
+from volleysheet.structure import MatchSheet
+
+def test_scores_et_sets_par_equipe(feuille: MatchSheet):
+    assert feuille.scores_equipes[:3].tolist() == [[25, 20], [25, 18], [22, 25]]
+    assert feuille.sets_gagnes() == (2, 1)
+
+def test_ingestion_par_equipe(feuille: MatchSheet):
+    connexion = ouvrir_saison(':memory:')
+    assert ingerer_match(connexion, {'feuille': feuille, 'date': '2026-10-18'}, 'abc')
+    assert connexion.execute("SELECT sets_a, sets_b FROM matchs").fetchone() == (2, 1)
+    assert connexion.execute("SELECT set_num, score_a, score_b FROM sets ORDER BY set_num").fetchall() == [
+        (1, 25, 20), (2, 25, 18), (3, 22, 25)]
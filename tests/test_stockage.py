@@ -0,0 +1,113 @@
+"""Analyses en arrière-plan : le suivi renvoyé par lancer_analyse se remplit pendant l'extraction."""
+import hashlib
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from volleysheet import pipeline, stockage
+from volleysheet.pipeline import ETAPES, construire_feuille, nouveau_match
+from volleysheet.extraction import GABARIT_DEFAUT, version_gabarits
+from volleysheet.stockage import EXTENSION, cle_stockage, ecrire_match, lancer_analyse, lire_match
+from volleysheet.structure import VERSION_MISE_EN_PAGE
+
+def match_structure() -> dict:
+    """Analyse complète construite à la main : deux sets joués, en-tête et zones brutes, effectifs."""
+    match = nouveau_match()
+    match['gabarit'] = dict(GABARIT_DEFAUT, empreinte='840x595|LIBEROS@-')
+    match['zones'] = {
+        'en_tete': [pd.DataFrame([['Match', '12/10/2025', np.nan], ['A', 'B', 3.0]])],
+        'scores': pd.DataFrame([['1', '25', '0'], ['2', '18', '1']]).astype(str),
+        'set_1_a': None,
+    }
+    match['equipes'] = ('ALPHA', 'BETA')
+    match['date'] = '2025-10-12'
+    match['scores'] = pd.DataFrame({'Scores Gauche (C0)': ['25', '18', None, None, None],
+                                    'Scores Droite (C1)': ['20', '25', None, None, None]},
+                                   index=[f'Set {i}' for i in range(1, 6)], dtype=object)
+    grille = pd.DataFrame([[''] * 6] * 12, columns=[f'C{j}' for j in range(6)]).astype(str)
+    grille.iloc[0] = ['1', '2', '3', '4', '5', '6']
+    grille.iloc[4:6] = [['1', '', '3', '', '', ''], ['4', '', '8', '', '', '']]
+    match['sets'] = {n: {'a': grille, 'b': grille.copy(), 'temps_morts': {'a': ('5:3', None), 'b': (None, None)}}
+                     for n in (1, 2)}
+    match['effectifs'] = {'joueurs': pd.DataFrame({'Numero': ['4'], 'Identite': ['DUPONT Léa'],
+                                                   'Licence': ['123'], 'Equipe': ['A']})}
+    match['feuille'] = construire_feuille(match)
+    match['durees'] = {'zones': 0.25}
+    return match
+
+def test_suivi_rempli_pendant_l_analyse(feuille_quadrillee, tmp_path, monkeypatch):
+    pdf = feuille_quadrillee(90, 20)
+    sha256 = hashlib.sha256(pdf + b'suivi').hexdigest()
+
+    # Effectifs retenus jusqu'à la fin des vérifications : l'analyse ne peut pas être terminée avant
+    liberation = threading.Event()
+    effectifs = pipeline.extraire_effectifs
+    monkeypatch.setattr(pipeline, 'extraire_effectifs', lambda pdf_bytes: liberation.wait(10) and effectifs(pdf_bytes))
+
+    suivi = lancer_analyse(pdf, sha256, 'pdfplumber', {}, str(tmp_path))
+    try:
+        for _ in range(100):
+            if 'structure' in suivi['etapes']:
+                break
+            threading.Event().wait(0.1)
+        assert not suivi['resultat'].done()
+        assert {'gabarit', 'en_tete', 'zones', 'structure'} <= set(suivi['etapes'])
+        assert suivi['match']['gabarit'] is not None
+        assert 'en_tete' in suivi['match']['zones']
+    finally:
+        liberation.set()
+
+    match = suivi['resultat'].result(timeout=30)
+    assert match is suivi['match']
+    assert sorted(suivi['etapes']) == sorted(ETAPES)
+    cle = cle_stockage(sha256, 'pdfplumber', VERSION_MISE_EN_PAGE, version_gabarits({}))
+    assert lire_match(str(tmp_path), cle) is not None
+
+def test_executeur_cree_a_la_premiere_analyse():
+    code = "import volleysheet.stockage as s; print(s._executeur_analyses)"
+    sortie = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    assert sortie.strip() == 'None'
+
+def test_analyse_relue_a_l_identique(tmp_path):
+    match = match_structure()
+    ecrire_match(str(tmp_path), 'cle', match)
+    relu = lire_match(str(tmp_path), 'cle')
+
+    for cle in ('gabarit', 'equipes', 'date', 'durees'):
+        assert relu[cle] == match[cle]
+    pd.testing.assert_frame_equal(relu['zones']['en_tete'][0], match['zones']['en_tete'][0])
+    pd.testing.assert_frame_equal(relu['zones']['scores'], match['zones']['scores'])
+    assert relu['zones']['set_1_a'] is None
+    pd.testing.assert_frame_equal(relu['scores'], match['scores'])
+    pd.testing.assert_frame_equal(relu['sets'][2]['a'], match['sets'][2]['a'])
+    assert relu['sets'][1]['temps_morts'] == match['sets'][1]['temps_morts']
+    pd.testing.assert_frame_equal(relu['effectifs']['joueurs'], match['effectifs']['joueurs'])
+
+    # Modèle typé reconstruit à la lecture
+    assert relu['feuille'].equipes == ('ALPHA', 'BETA')
+    assert np.array_equal(relu['feuille'].scores_sets, match['feuille'].scores_sets)
+    assert np.array_equal(relu['feuille'].sets[1][0].scores, match['feuille'].sets[1][0].scores)
+    assert np.array_equal(relu['feuille'].chronologies[2], match['feuille'].chronologies[2])
+
+def test_entree_pickle_jamais_executee(tmp_path):
+    class Charge:
+        def __reduce__(self):
+            return (open, (str(tmp_path / 'execute'), 'w'))
+
+    chemin = tmp_path / ('cle' + EXTENSION)
+    chemin.write_bytes(zlib.compress(pickle.dumps({'zones': Charge()})))
+    assert lire_match(str(tmp_path), 'cle') is None
+    assert not (tmp_path / 'execute').exists()
+    assert not chemin.exists()  # retirée : elle sera recalculée
+
+def test_cle_change_avec_le_format(monkeypatch):
+    cle = cle_stockage('abc', 'pdfplumber', 3, 'r1')
+    monkeypatch.setattr(stockage, 'FORMAT_STOCKAGE', stockage.FORMAT_STOCKAGE + 1)
+    assert cle_stockage('abc', 'pdfplumber', 3, 'r1') != cle
@@ -0,0 +1,58 @@
+"""
+Structuration des zones brutes : moteur déclaratif unique comparé aux anciennes fonctions par set, et temps morts
+lus dans les grilles déjà extraites.
+"""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from volleysheet.structure import extraire_temps_morts, structurer_zone
+
+# Sorties des anciennes fonctions process_and_structure_set_<n>_<a|b>, relevées sur des grilles brutes dont
+# chaque case porte sa position "ligne.colonne" ; grilles pleines et grilles tronquées
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feuilles', 'structuration_par_set.json'),
+          encoding='utf-8') as f:
+    CAS_PAR_SET = json.load(f)
+
+def grille_brute(lignes: int, colonnes: int) -> pd.DataFrame:
+    return pd.DataFrame([[f'{i}.{j}' for j in range(colonnes)] for i in range(lignes)]).astype(str)
+
+@pytest.mark.parametrize('cas', CAS_PAR_SET, ids=lambda c: f"{c['zone']}-{c['lignes']}x{c['colonnes']}")
+def test_structuration_identique_aux_fonctions_par_set(cas):
+    structure = structurer_zone(grille_brute(cas['lignes'], cas['colonnes']), cas['zone'])
+    assert structure.shape == (12, 6)
+    assert structure.columns.tolist() == [f'C{j}' for j in range(6)]
+    assert structure.values.tolist() == cas['attendu']
+
+def test_zone_absente():
+    structure = structurer_zone(None, 'set_1_a')
+    assert structure.shape == (12, 6)
+    assert (structure == '').all().all()
+
+@pytest.mark.parametrize('set_num, zone, attendu', [
+    (1, 'set_1_b', {'a': ('8.1', '9.1'), 'b': ('8.14', '9.14')}),
+    (2, 'set_2_a', {'a': ('8.13', '9.13'), 'b': ('8.0', '9.0')}),
+    (3, 'set_3_b', {'a': ('8.1', '9.0'), 'b': ('8.14', '9.13')}),
+    (4, 'set_4_a', {'a': ('8.13', '9.13'), 'b': ('8.0', '9.0')}),
+    (5, 'set_5_b', {'a': ('7.1', '8.1'), 'b': ('7.14', '8.14')}),
+])
+def test_temps_morts_lus_dans_la_zone_du_set(set_num, zone, attendu):
+    assert extraire_temps_morts({zone: grille_brute(18, 15)}, set_num) == attendu
+
+def test_temps_morts_set_5_cases_de_secours():
+    # Cases vides ou 'None' de l'équipe a : relues en R16 / R17, colonne 12
+    grille = grille_brute(18, 15)
+    grille.iloc[7, 1] = ''
+    grille.iloc[8, 1] = 'None'
+    assert extraire_temps_morts({'set_5_b': grille}, 5) == {'a': ('16.12', '17.12'), 'b': ('7.14', '8.14')}
+
+    # Grille trop courte pour les cases de secours
+    assert extraire_temps_morts({'set_5_b': grille.iloc[:17]}, 5)['a'] == ('16.12', None)
+
+def test_temps_morts_zone_absente_ou_tronquee():
+    assert extraire_temps_morts({'set_1_b': None}, 1) == {'a': (None, None), 'b': (None, None)}
+    assert extraire_temps_morts({}, 2) == {'a': (None, None), 'b': (None, None)}
+    assert extraire_temps_morts({'set_3_b': pd.DataFrame()}, 3) == {'a': (None, None), 'b': (None, None)}
+    assert extraire_temps_morts({'set_1_b': grille_brute(9, 15)}, 1) == {'a': ('8.1', None), 'b': ('8.14', None)}
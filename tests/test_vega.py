@@ -0,0 +1,49 @@
+"""Contenu des spécifications Vega-Lite (duel et rotations) pour le début de set de la fixture set_court."""
+import json
+
+from volleysheet.vega import COULEUR_A, COULEUR_D, COULEUR_G, spec_duel_equipes, spec_rotations
+
+def couche(spec: dict, marque: str) -> dict:
+    return next(c for c in spec['layer'] if c['mark']['type'] == marque)
+
+def test_duel_barres_joueurs_et_sequences(set_court):
+    spec = spec_duel_equipes(*set_court, titre="Évolution Set 1", nom_g='ALPHA', nom_d='BETA')
+    json.dumps(spec)  # sérialisable tel quel pour le navigateur
+    assert spec['title'] == "Évolution Set 1"
+
+    # Une barre par tour de service marqué, du score avant le tour au score après
+    barres = couche(spec, 'rect')['data']['values']
+    assert [(b['bas'], b['haut'], b['equipe']) for b in barres] == [
+        (0, 2, 'BETA'), (0, 3, 'ALPHA'), (2, 4, 'BETA'), (3, 5, 'ALPHA'), (4, 5, 'BETA'), (5, 6, 'ALPHA')]
+    assert [b['x0'] for b in barres] == [x - 0.2 for x in range(6)]
+
+    # Serveurs de la ligne dans l'ordre de jeu, sans la case barrée de A : B (21) sert en premier
+    joueurs = couche(spec, 'text')['data']['values']
+    assert [j['libelle'] for j in joueurs] == ['21', '12', '22', '13', '23', '14', '24', '15', '25', '16', '26']
+    assert [j['couleur'] for j in joueurs[:2]] == [COULEUR_D, COULEUR_G]
+
+    sequences = couche(spec, 'rule')['data']['values']
+    assert sequences == [{'milieu': 5.0, 'separation': 10.5, 'nom': "1ère séquence"}]
+
+def test_duel_sans_equipe():
+    assert spec_duel_equipes(None, None) is None
+
+def test_rotations_terrains_et_points(set_court):
+    spec = spec_rotations(*set_court, 'ALPHA', 'BETA')
+    json.dumps(spec)
+    valeurs = spec['data']['values']
+    par_genre = {genre: [v for v in valeurs if v['genre'] == genre] for genre in ('terrain', 'joueur', 'statistique')}
+    # 6 rotations x 2 services : un terrain, 12 joueurs et 3 colonnes de points chacun
+    assert (len(par_genre['terrain']), len(par_genre['joueur']), len(par_genre['statistique'])) == (12, 144, 36)
+
+    # Rotation I, A au service : le joueur en I (11) sert depuis l'extérieur du terrain
+    rotation_1 = [v for v in par_genre['joueur'] if v['rotation'] == 'Rotation I' and v['service'] == 'A']
+    serveur = next(v for v in rotation_1 if v['texte'] == '11')
+    assert (serveur['x'], serveur['y'], serveur['couleur']) == (-1.5, 1.5, COULEUR_A)
+
+    # Rotation II : A marque 3 points à son passage au service et B 2 au sien
+    points = {(v['service'], v['x']): v['lignes'] for v in par_genre['statistique'] if v['rotation'] == 'Rotation II'}
+    assert points[('A', 1)] == ['pts marqués', '1  3', '', 'Total: 3']
+    assert points[('A', 7)] == ['pts encaissés', '1  2', '', 'Total: 2']
+    assert points[('A', 13)] == ['différence', '+1', '', 'Total: +1']
+    assert points[('B', 13)] == ['différence', '-1', '', 'Total: -1']
@@ -0,0 +1,10 @@
+"""
+Analyse de feuilles de match de volley-ball (PDF) : extraction, structuration, rotations, graphiques et export.
+Aucun effet de bord à l'import (pas d'interface) : l'application Streamlit et la ligne de commande s'appuient dessus.
+"""
+from volleysheet.extraction import BACKENDS_TABULA, MOTEURS_EXTRACTION, charger_gabarits, version_gabarits
+from volleysheet.pipeline import ETAPES, analyser_feuille
+from volleysheet.structure import VERSION_MISE_EN_PAGE, MatchSheet, TeamSet
+
+__all__ = ['BACKENDS_TABULA', 'MOTEURS_EXTRACTION', 'charger_gabarits', 'version_gabarits', 'ETAPES',
+           'analyser_feuille', 'VERSION_MISE_EN_PAGE', 'MatchSheet', 'TeamSet']
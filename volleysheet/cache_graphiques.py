@@ -0,0 +1,94 @@
+"""
+Cache mémoire des graphiques rendus (images PNG ou spécifications Vega-Lite), partagé par toutes les sessions
+du serveur : clé = (analyse du match, set, type de graphique, rendu), éviction LRU sous un plafond de taille.
+"""
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+# Taille maximale en Mo via VOLLEY_CACHE_GRAPHIQUES_MO
+TAILLE_MAX_CACHE_GRAPHIQUES = int(os.environ.get('VOLLEY_CACHE_GRAPHIQUES_MO', '128')) * 1024 * 1024
+
+_GRAPHIQUES = OrderedDict()  # clé -> (graphique, taille en octets), du moins au plus récemment utilisé
+_ETAT = {'taille': 0, 'succes': 0, 'echecs': 0}
+_EN_CONSTRUCTION = {}  # clé -> threading.Event : un graphique n'est construit qu'une fois, même demandé deux fois
+_VERROU = threading.Lock()
+
+def taille_graphique(graphique) -> int:
+    """Place occupée par un graphique : octets de l'image, ou longueur JSON d'une spécification."""
+    if isinstance(graphique, (bytes, bytearray)):
+        return len(graphique)
+    return len(json.dumps(graphique, ensure_ascii=False))
+
+def graphique_en_cache(cle: tuple, construire, taille_max: int = TAILLE_MAX_CACHE_GRAPHIQUES):
+    """
+    Renvoie le graphique de la clé, construit par `construire()` au premier appel puis servi depuis le cache.
+    Un graphique vide (None) ou plus gros que le plafond n'est pas conservé. Si la même clé est déjà en
+    construction (préchargement, autre session), on attend ce résultat au lieu de le construire une seconde fois.
+    """
+    while True:
+        with _VERROU:
+            if cle in _GRAPHIQUES:
+                _GRAPHIQUES.move_to_end(cle)
+                _ETAT['succes'] += 1
+                return _GRAPHIQUES[cle][0]
+            attente = _EN_CONSTRUCTION.get(cle)
+            if attente is None:
+                _EN_CONSTRUCTION[cle] = threading.Event()
+                _ETAT['echecs'] += 1
+                break
+        # Construit ailleurs : s'il n'est pas conservé (échec, None, trop gros), on le construira nous-mêmes
+        attente.wait()
+        with _VERROU:
+            if cle not in _GRAPHIQUES:
+                return construire()
+
+    # Construction hors verrou : les autres sessions ne l'attendent pas
+    try:
+        graphique = construire()
+        taille = 0 if graphique is None else taille_graphique(graphique)
+        if graphique is not None and taille <= taille_max:
+            with _VERROU:
+                _GRAPHIQUES[cle] = (graphique, taille)
+                _ETAT['taille'] += taille
+                while _ETAT['taille'] > taille_max:
+                    _, (_, taille_evincee) = _GRAPHIQUES.popitem(last=False)
+                    _ETAT['taille'] -= taille_evincee
+        return graphique
+    finally:
+        with _VERROU:
+            _EN_CONSTRUCTION.pop(cle).set()
+
+def prechauffer_graphiques(taches: list):
+    """
+    Construit en arrière-plan (thread démon) les graphiques [(clé, construire), ...] absents du cache, dans
+    l'ordre : la page affiche le set demandé pendant que ses voisins se préparent.
+    """
+    with _VERROU:
+        taches = [(cle, construire) for cle, construire in taches
+                  if cle not in _GRAPHIQUES and cle not in _EN_CONSTRUCTION]
+    if not taches:
+        return
+
+    def prechauffer():
+        for cle, construire in taches:
+            try:
+                graphique_en_cache(cle, construire)
+            except Exception:
+                # Sans conséquence : le graphique sera reconstruit (et l'erreur affichée) s'il est demandé
+                logging.getLogger('volleysheet').exception("Préchargement du graphique %s impossible", cle)
+
+    threading.Thread(target=prechauffer, name='prechargement-graphiques', daemon=True).start()
+
+def etat_cache_graphiques() -> dict:
+    """Entrées, taille occupée (octets) et nombre de succès / échecs du cache."""
+    with _VERROU:
+        return {'entrees': len(_GRAPHIQUES), 'en_construction': len(_EN_CONSTRUCTION), **_ETAT}
+
+def vider_cache_graphiques():
+    """Vide le cache (les compteurs repartent de zéro)."""
+    with _VERROU:
+        _GRAPHIQUES.clear()
+        _ETAT.update(taille=0, succes=0, echecs=0)
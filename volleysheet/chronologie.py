@@ -0,0 +1,89 @@
+"""Chronologie point par point d'un set, reconstruite depuis les grilles de score (tableau structuré NumPy)."""
+import numpy as np
+
+from volleysheet.structure import CASE_X, VIDE, TeamSet
+
+# Équipes codées 0 (a) et 1 (b). 'tour' = case de la feuille qui porte le point : ligne * 12 + colonne * 2 + ordre
+# de service dans la colonne (voir tours_de_service).
+DTYPE_CHRONOLOGIE = np.dtype([
+    ('point', np.int16),           # rang du point dans le set (0, 1, ...)
+    ('marqueur', np.int8),         # équipe qui marque
+    ('score_a', np.int16),         # score après le point
+    ('score_b', np.int16),
+    ('service', np.int8),          # équipe au service pendant l'échange
+    ('serveur', np.int16),         # numéro du serveur (VIDE si inconnu)
+    ('rotation_a', np.int8),       # rotation (0 = I ... 5 = VI) de chaque équipe pendant l'échange
+    ('rotation_b', np.int8),
+    ('tour', np.int16),
+])
+
+def tours_de_service(equipe_a: TeamSet, equipe_b: TeamSet) -> dict:
+    """
+    Toutes les cases de service dans l'ordre de jeu : ligne par ligne, colonne par colonne, et dans chaque colonne
+    l'équipe qui reçoit en premier (celle dont la première case est barrée 'X') avant l'autre.
+    Retourne des tableaux (96,) : 'equipe', 'colonne', 'fin' (score à la fin du tour), 'serveur' et 'tour'.
+    """
+    ordre = np.array([0, 1] if equipe_a.scores[0, 0] == CASE_X else [1, 0])
+    scores = np.stack([equipe_a.scores, equipe_b.scores])          # (2, 8, 6)
+    formations = np.stack([equipe_a.formation, equipe_b.formation])  # (2, 6)
+
+    lignes, colonnes, rangs = np.indices(scores.shape[1:] + (2,)).reshape(3, -1)
+    equipes = ordre[rangs]
+    return {
+        'equipe': equipes,
+        'colonne': colonnes,
+        'fin': scores[equipes, lignes, colonnes],
+        'serveur': formations[equipes, colonnes],
+        'tour': np.arange(equipes.size),
+    }
+
+def construire_chronologie(equipe_a: TeamSet, equipe_b: TeamSet) -> np.ndarray:
+    """
+    Déroule le set point par point en un seul passage vectorisé.
+    Chaque tour de service d'une équipe porte ses points depuis son tour précédent : le premier est gagné en
+    réception (side-out, sur le service adverse), les suivants sur son propre service.
+    """
+    tours = tours_de_service(equipe_a, equipe_b)
+    joues = (tours['fin'] != VIDE) & (tours['fin'] != CASE_X)
+    equipe, colonne, fin, serveur, tour = (tours[cle][joues] for cle in ('equipe', 'colonne', 'fin', 'serveur', 'tour'))
+    n = equipe.size
+    if n == 0:
+        return np.zeros(0, dtype=DTYPE_CHRONOLOGIE)
+
+    # Points de chaque tour : écart avec le tour précédent de la même équipe ; rotation de chaque équipe après le tour
+    points = np.zeros(n, dtype=np.int64)
+    rotations = np.zeros((2, n), dtype=np.int64)
+    for code in (0, 1):
+        siens = equipe == code
+        points[siens] = np.diff(fin[siens].astype(np.int64), prepend=0)
+        dernier = np.maximum.accumulate(np.where(siens, np.arange(n), -1))
+        rotations[code] = np.where(dernier >= 0, colonne[np.maximum(dernier, 0)], 0)
+    points = np.maximum(points, 0)
+    rotations_avant = np.concatenate([np.zeros((2, 1), dtype=np.int64), rotations[:, :-1]], axis=1)
+
+    # Deux segments par tour : le side-out (pendant le tour adverse précédent) puis les points au service
+    side_out = ((np.arange(n) > 0) & (points > 0)).astype(np.int64)
+    effectifs = np.column_stack([side_out, points - side_out]).ravel()
+    precedent = np.maximum(np.arange(n) - 1, 0)
+
+    def segments(pendant_side_out, pendant_service):
+        return np.repeat(np.column_stack([pendant_side_out, pendant_service]).ravel(), effectifs)
+
+    chronologie = np.zeros(int(effectifs.sum()), dtype=DTYPE_CHRONOLOGIE)
+    chronologie['point'] = np.arange(chronologie.size)
+    chronologie['marqueur'] = segments(equipe, equipe)
+    chronologie['service'] = segments(equipe[precedent], equipe)
+    chronologie['serveur'] = segments(serveur[precedent], serveur)
+    chronologie['rotation_a'] = segments(rotations_avant[0], rotations[0])
+    chronologie['rotation_b'] = segments(rotations_avant[1], rotations[1])
+    chronologie['tour'] = segments(tour, tour)
+    chronologie['score_a'] = np.cumsum(chronologie['marqueur'] == 0)
+    chronologie['score_b'] = np.cumsum(chronologie['marqueur'] == 1)
+    return chronologie
+
+def bilan_rotations(chronologie: np.ndarray, code_equipe: int) -> dict:
+    """Points gagnés, perdus et différence d'une équipe selon sa rotation au moment de l'échange (6 valeurs)."""
+    rotation = chronologie['rotation_a'] if code_equipe == 0 else chronologie['rotation_b']
+    gagnes = np.bincount(rotation, weights=chronologie['marqueur'] == code_equipe, minlength=6).astype(np.int64)
+    perdus = np.bincount(rotation, weights=chronologie['marqueur'] != code_equipe, minlength=6).astype(np.int64)
+    return {'gagnes': gagnes, 'perdus': perdus, 'differentiel': gagnes - perdus}
@@ -0,0 +1,219 @@
+"""Ligne de commande : `python -m volleysheet batch <dossier>` traite un dossier de feuilles sans interface."""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from volleysheet.export import ajouter_saison_parquet, ecrire_classeur_matchs
+from volleysheet.extraction import (BACKENDS_TABULA, MOTEURS_EXTRACTION, charger_gabarits, configurer_backend_tabula,
+                                    demarrer_backend_tabula, notifier_journal)
+from volleysheet.pipeline import ETAPES
+from volleysheet.saison import FICHIER_SAISON, ecrire_lignes, hashes_ingeres, lignes_saison, ouvrir_saison
+from volleysheet.stockage import DOSSIER_STOCKAGE, analyser_avec_stockage
+
+FICHIER_RESUME = 'resume_lot.json'
+
+# Réglages propres à chaque processus de travail (posés par _initialiser_worker)
+_REGLAGES_WORKER = {'moteur': MOTEURS_EXTRACTION[0], 'gabarits': {}, 'stockage': DOSSIER_STOCKAGE}
+
+# ======================================================================
+# TRAVAIL D'UN PROCESSUS - Une feuille de match
+# ======================================================================
+
+def _initialiser_worker(moteur: str, backend: str, gabarits: dict, stockage: str):
+    """Exécuté une fois par processus : journal, réglages et JVM tabula persistante (réutilisée par tout le lot)."""
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    _REGLAGES_WORKER.update(moteur=moteur, gabarits=gabarits, stockage=stockage)
+    configurer_backend_tabula(backend)
+    if moteur == 'tabula':
+        demarrer_backend_tabula()
+
+def _resultat_json(match: dict, fichier: str, sha256: str) -> dict:
+    """Résultat structuré d'un match, sérialisable en JSON."""
+    feuille = match['feuille']
+    return {
+        'fichier': fichier,
+        'sha256': sha256,
+        'gabarit': {'empreinte': match['gabarit']['empreinte'], 'nom': match['gabarit']['nom']},
+        'equipes': list(match['equipes']),
+        'scores_sets': None if feuille is None else feuille.scores_sets.tolist(),
+        'sets': {str(n): {'a': s['a'].to_numpy().tolist(), 'b': s['b'].to_numpy().tolist(),
+                          'temps_morts': {cote: list(tm) for cote, tm in s['temps_morts'].items()}}
+                 for n, s in match['sets'].items()},
+        'effectifs': {nom: df.to_dict(orient='records') for nom, df in match['effectifs'].items()},
+        'durees': match['durees'],
+    }
+
+def traiter_fichier(chemin: str, sortie: str, saison: bool = False, parquet: str = None,
+                    excel: bool = False) -> dict:
+    """
+    Analyse une feuille, écrit <sortie>/<nom>.json et renvoie la ligne du résumé (statut et durées).
+    Avec `saison`, la ligne porte aussi les lignes à verser dans la base de saison (écrites par le processus parent) ;
+    avec `parquet`, le match est ajouté au jeu de données Parquet de ce dossier (un fichier par match et partition) ;
+    avec `excel`, la ligne porte le match analysé (ce que lit le classeur), écrit puis oublié par le parent.
+    """
+    fichier = os.path.basename(chemin)
+    debut = time.perf_counter()
+    try:
+        with open(chemin, 'rb') as f:
+            pdf_bytes = f.read()
+        sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+        match = analyser_avec_stockage(pdf_bytes, sha256, _REGLAGES_WORKER['moteur'], _REGLAGES_WORKER['gabarits'],
+                                       _REGLAGES_WORKER['stockage'], notifier_journal)
+
+        cible = os.path.join(sortie, os.path.splitext(fichier)[0] + '.json')
+        with open(cible, 'w', encoding='utf-8') as f:
+            json.dump(_resultat_json(match, fichier, sha256), f, ensure_ascii=False, indent=1)
+        # Sans tableau des scores, le match est écrit mais signalé comme incomplet
+        ligne = {'fichier': fichier, 'statut': 'ok' if match['feuille'] is not None else 'incomplet',
+                 'sets': len(match['sets']), 'durees': match['durees'], 'duree': time.perf_counter() - debut}
+        if saison:
+            ligne['saison'] = lignes_saison(match, sha256, fichier)
+        if parquet:
+            ajouter_saison_parquet(match, sha256, parquet)
+        if excel:
+            ligne['match'] = {cle: match[cle] for cle in ('feuille', 'equipes', 'date', 'sets')}
+        return ligne
+    except Exception as e:
+        return {'fichier': fichier, 'statut': 'erreur', 'erreur': str(e), 'durees': {},
+                'duree': time.perf_counter() - debut}
+
+# ======================================================================
+# LOT - Répartition sur un pool de processus et résumé
+# ======================================================================
+
+def _sha256_fichier(chemin: str) -> str:
+    """SHA-256 du contenu d'un fichier (même clé que l'application et le stockage)."""
+    with open(chemin, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _matchs_des_lignes(lignes_lot, lignes: list):
+    """
+    Parcourt les lignes renvoyées par les processus (dans l'ordre des fichiers, au fil de l'eau) : chaque ligne est
+    rangée dans `lignes` sans son match, et le match est rendu au classeur Excel, qui l'écrit puis l'oublie.
+    """
+    for ligne in lignes_lot:
+        match = ligne.pop('match', None)
+        lignes.append(ligne)
+        if match is not None:
+            yield match
+
+def traiter_lot(dossier: str, sortie: str, workers: int, moteur: str, backend: str,
+                stockage: str = DOSSIER_STOCKAGE, saison: str = None, parquet: str = None, excel: str = None) -> dict:
+    """
+    Traite toutes les feuilles PDF d'un dossier en parallèle et écrit le résumé du lot.
+    Avec `saison` (chemin de la base), les PDF déjà versés sont ignorés et les nouveaux matchs y sont versés ;
+    avec `parquet`, chaque match est aussi ajouté au jeu de données Parquet de saison ; avec `excel`, les matchs
+    analysés par les processus sont écrits en flux, un à la fois, dans ce classeur (découpé en plusieurs fichiers
+    au-delà de ONGLETS_MAX_CLASSEUR onglets de sets).
+    """
+    fichiers = sorted(os.path.join(dossier, nom) for nom in os.listdir(dossier) if nom.lower().endswith('.pdf'))
+    os.makedirs(sortie, exist_ok=True)
+
+    debut = time.perf_counter()
+    connexion, deja_ingeres = None, 0
+    if saison:
+        connexion = ouvrir_saison(saison)
+        connus = hashes_ingeres(connexion)
+        nouveaux = [chemin for chemin in fichiers if _sha256_fichier(chemin) not in connus]
+        deja_ingeres, fichiers = len(fichiers) - len(nouveaux), nouveaux
+
+    gabarits = charger_gabarits()
+    lignes = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialiser_worker,
+                             initargs=(moteur, backend, gabarits, stockage)) as executor:
+        lignes_lot = executor.map(partial(traiter_fichier, sortie=sortie, saison=bool(saison), parquet=parquet,
+                                          excel=bool(excel)), fichiers)
+        classeurs = []
+        if excel:
+            # Classeur écrit pendant le lot, depuis les analyses des processus (aucune ré-extraction dans le parent)
+            classeurs = ecrire_classeur_matchs(_matchs_des_lignes(lignes_lot, lignes), excel)
+        else:
+            lignes.extend(lignes_lot)
+
+    # Un seul écrivain pour la base : le processus parent
+    ingeres = 0
+    if connexion is not None:
+        for ligne in lignes:
+            lignes_match = ligne.pop('saison', None)
+            if lignes_match is not None:
+                ingeres += ecrire_lignes(connexion, lignes_match)
+        connexion.close()
+
+    duree_totale = time.perf_counter() - debut
+
+    analyses = [ligne for ligne in lignes if ligne['statut'] != 'erreur']
+    resume = {
+        'dossier': dossier,
+        'moteur': moteur,
+        'workers': workers,
+        'matchs': len(lignes),
+        'reussis': sum(ligne['statut'] == 'ok' for ligne in lignes),
+        'incomplets': sum(ligne['statut'] == 'incomplet' for ligne in lignes),
+        'echecs': len(lignes) - len(analyses),
+        'deja_ingeres': deja_ingeres,
+        'ingeres': ingeres,
+        'classeurs_excel': classeurs,
+        'duree_totale': duree_totale,
+        'matchs_par_seconde': len(lignes) / duree_totale if duree_totale > 0 else 0.0,
+        # Les extractions d'une feuille se chevauchent : la somme des étapes dépasse sa durée réelle. Une analyse
+        # stockée avant le découpage de l'en-tête n'a pas d'étape 'en_tete' (comptée 0).
+        'durees_etapes': {etape: {'total': sum(ligne['durees'].get(etape, 0.0) for ligne in analyses),
+                                  'moyenne': (sum(ligne['durees'].get(etape, 0.0) for ligne in analyses) / len(analyses)
+                                              if analyses else 0.0)}
+                          for etape in ETAPES},
+        'fichiers': lignes,
+    }
+    with open(os.path.join(sortie, FICHIER_RESUME), 'w', encoding='utf-8') as f:
+        json.dump(resume, f, ensure_ascii=False, indent=1)
+    return resume
+
+def afficher_resume(resume: dict):
+    """Affiche le débit du lot et le temps passé par étape."""
+    print(f"{resume['matchs']} feuilles ({resume['reussis']} ok, {resume['incomplets']} incomplètes, "
+          f"{resume['echecs']} en échec) "
+          f"en {resume['duree_totale']:.2f} s avec {resume['workers']} processus : "
+          f"{resume['matchs_par_seconde']:.2f} matchs/s")
+    if resume['ingeres'] or resume['deja_ingeres']:
+        print(f"Saison : {resume['ingeres']} matchs versés, {resume['deja_ingeres']} déjà présents (ignorés)")
+    if resume['classeurs_excel']:
+        print(f"Classeur Excel : {', '.join(resume['classeurs_excel'])}")
+    print(f"{'Étape':<12}{'Total (s)':>12}{'Moyenne (s)':>14}")
+    for etape, duree in resume['durees_etapes'].items():
+        print(f"{etape:<12}{duree['total']:>12.3f}{duree['moyenne']:>14.3f}")
+    for ligne in resume['fichiers']:
+        if ligne['statut'] == 'erreur':
+            print(f"❌ {ligne['fichier']} : {ligne['erreur']}")
+        elif ligne['statut'] == 'incomplet':
+            print(f"⚠️ {ligne['fichier']} : tableau des scores introuvable")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='volleysheet', description="Analyse de feuilles de match de volley (PDF).")
+    commandes = parser.add_subparsers(dest='commande', required=True)
+
+    batch = commandes.add_parser('batch', help="traite toutes les feuilles PDF d'un dossier")
+    batch.add_argument('dossier', help="dossier contenant les feuilles PDF")
+    batch.add_argument('--sortie', default=None, help="dossier des résultats (par défaut : <dossier>/resultats)")
+    batch.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    batch.add_argument('--moteur', choices=MOTEURS_EXTRACTION,
+                       default=os.environ.get('VOLLEY_MOTEUR_EXTRACTION', MOTEURS_EXTRACTION[0]))
+    batch.add_argument('--tabula-backend', choices=BACKENDS_TABULA,
+                       default=os.environ.get('VOLLEY_TABULA_BACKEND', BACKENDS_TABULA[0]))
+    batch.add_argument('--stockage', default=DOSSIER_STOCKAGE,
+                       help="stockage partagé des analyses (chaîne vide : désactivé)")
+    batch.add_argument('--saison', nargs='?', const=FICHIER_SAISON, default=None,
+                       help=f"verse les matchs dans la base de saison SQLite (par défaut : {FICHIER_SAISON})")
+    batch.add_argument('--parquet', default=None, help="ajoute les matchs au jeu de données Parquet de ce dossier")
+    batch.add_argument('--excel', default=None, help="écrit tous les matchs du lot dans ce classeur .xlsx")
+
+    args = parser.parse_args(argv)
+    if args.commande == 'batch':
+        sortie = args.sortie or os.path.join(args.dossier, 'resultats')
+        resume = traiter_lot(args.dossier, sortie, max(1, args.workers), args.moteur, args.tabula_backend,
+                             args.stockage, args.saison, args.parquet, args.excel)
+        afficher_resume(resume)
+        return 1 if resume['echecs'] or resume['incomplets'] else 0
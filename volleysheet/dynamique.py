@@ -0,0 +1,107 @@
+"""Séries de points et dynamique d'un set, calculées sur la chronologie point par point (encodage par plages)."""
+import numpy as np
+
+from volleysheet.chronologie import DTYPE_CHRONOLOGIE
+
+FENETRE_DYNAMIQUE = 5  # points pris en compte par l'indice de dynamique glissant
+SERIE_MIN = 3          # à partir de combien de points d'affilée une série compte comme « trou »
+
+DTYPE_SERIES = np.dtype([
+    ('equipe', np.int8),           # équipe qui marque la série (0 = a, 1 = b)
+    ('longueur', np.int16),        # points d'affilée
+    ('premier_point', np.int16),   # rang du premier point de la série dans le set
+    ('debut_a', np.int16),         # score avant la série
+    ('debut_b', np.int16),
+    ('fin_a', np.int16),           # score après la série
+    ('fin_b', np.int16),
+    ('rotation_a', np.int8),       # rotation de chaque équipe au premier point de la série
+    ('rotation_b', np.int8),
+])
+
+# ======================================================================
+# SÉRIES - Encodage par plages des points consécutifs d'une même équipe
+# ======================================================================
+
+def series_de_points(chronologie: np.ndarray) -> np.ndarray:
+    """Découpe le set en séries de points consécutifs d'une même équipe, sans boucle Python."""
+    n = chronologie.size
+    if n == 0:
+        return np.zeros(0, dtype=DTYPE_SERIES)
+
+    debuts = np.flatnonzero(np.diff(chronologie['marqueur'], prepend=-1))
+    longueurs = np.diff(debuts, append=n)
+    premiers, derniers = chronologie[debuts], chronologie[debuts + longueurs - 1]
+
+    series = np.zeros(debuts.size, dtype=DTYPE_SERIES)
+    series['equipe'] = premiers['marqueur']
+    series['longueur'] = longueurs
+    series['premier_point'] = debuts
+    series['debut_a'] = premiers['score_a'] - (premiers['marqueur'] == 0)
+    series['debut_b'] = premiers['score_b'] - (premiers['marqueur'] == 1)
+    series['fin_a'] = derniers['score_a']
+    series['fin_b'] = derniers['score_b']
+    series['rotation_a'] = premiers['rotation_a']
+    series['rotation_b'] = premiers['rotation_b']
+    return series
+
+def plus_longues_series(series: np.ndarray) -> tuple:
+    """Longueur de la plus longue série de chaque équipe (a, b) ; 0 si l'équipe n'a pas marqué."""
+    return tuple(int(series['longueur'][series['equipe'] == code].max(initial=0)) for code in (0, 1))
+
+def series_encaissees_par_rotation(series: np.ndarray, code_equipe: int, longueur_min: int = SERIE_MIN) -> dict:
+    """
+    Séries adverses d'au moins `longueur_min` points, regroupées selon la rotation de l'équipe qui les subit
+    au premier point : nombre de séries et points encaissés par rotation (6 valeurs).
+    """
+    subies = series[(series['equipe'] != code_equipe) & (series['longueur'] >= longueur_min)]
+    rotation = subies['rotation_a'] if code_equipe == 0 else subies['rotation_b']
+    return {
+        'series': np.bincount(rotation, minlength=6),
+        'points': np.bincount(rotation, weights=subies['longueur'], minlength=6).astype(np.int64),
+    }
+
+# ======================================================================
+# SIDE-OUT ET BREAK - Efficacité en réception et au service
+# ======================================================================
+
+def side_out_break(chronologie: np.ndarray, code_equipe: int) -> dict:
+    """
+    Échanges joués en réception (side-out) et au service (break) par une équipe, et points gagnés dans chaque cas.
+    Les pourcentages valent NaN quand l'équipe n'a joué aucun échange de ce type.
+    """
+    au_service = chronologie['service'] == code_equipe
+    gagnes = chronologie['marqueur'] == code_equipe
+    bilan = {
+        'receptions': int((~au_service).sum()), 'side_out': int((gagnes & ~au_service).sum()),
+        'services': int(au_service.sum()), 'break': int((gagnes & au_service).sum()),
+    }
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bilan['pct_side_out'] = float(np.float64(bilan['side_out']) / bilan['receptions'] * 100)
+        bilan['pct_break'] = float(np.float64(bilan['break']) / bilan['services'] * 100)
+    return bilan
+
+# ======================================================================
+# INDICE DE DYNAMIQUE - Somme glissante des points (+1 pour a, -1 pour b)
+# ======================================================================
+
+def indice_dynamique(chronologie: np.ndarray, fenetre: int = FENETRE_DYNAMIQUE) -> np.ndarray:
+    """
+    Indice de dynamique après chaque point : solde des `fenetre` derniers points du point de vue de l'équipe a
+    (de -fenetre à +fenetre). Les premiers points utilisent une fenêtre tronquée.
+    """
+    signe = np.where(chronologie['marqueur'] == 0, 1, -1)
+    cumul = np.cumsum(signe)
+    return cumul - np.concatenate([np.zeros(min(fenetre, cumul.size), dtype=cumul.dtype), cumul[:-fenetre]])
+
+def bilan_dynamique(chronologie: np.ndarray, fenetre: int = FENETRE_DYNAMIQUE) -> dict:
+    """Toute l'analyse de dynamique d'un set : séries, plus longues séries, side-out / break et indice glissant."""
+    if chronologie is None:
+        chronologie = np.zeros(0, dtype=DTYPE_CHRONOLOGIE)
+    series = series_de_points(chronologie)
+    return {
+        'series': series,
+        'plus_longues': plus_longues_series(series),
+        'side_out_break': (side_out_break(chronologie, 0), side_out_break(chronologie, 1)),
+        'trous': (series_encaissees_par_rotation(series, 0), series_encaissees_par_rotation(series, 1)),
+        'indice': indice_dynamique(chronologie, fenetre),
+    }
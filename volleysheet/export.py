@@ -0,0 +1,272 @@
+"""
+Exports : classeur Excel des tableaux des sets (un onglet par set, les deux équipes côte à côte) pour la lecture,
+et fichiers Parquet (schéma stable, colonnes équipes et joueurs encodées en dictionnaire) pour l'analyse.
+"""
+import datetime
+import io
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from volleysheet.chronologie import DTYPE_CHRONOLOGIE
+
+# ======================================================================
+# EXPORT EXCEL - Tableaux des sets côte à côte, écrits ligne par ligne
+# ======================================================================
+
+COLONNES_VOLLEY = ['I', 'II', 'III', 'IV', 'V', 'VI']
+ECART_TABLEAUX = 2  # colonnes vides entre le tableau de gauche et celui de droite
+ONGLETS_MAX_CLASSEUR = 250  # onglets de sets par fichier : un descripteur ouvert chacun (limite usuelle : 1024)
+
+def _nom_onglet(nom: str) -> str:
+    """Nom d'onglet valide pour Excel (31 caractères, sans []:*?/\\)."""
+    return ''.join(c for c in nom if c not in '[]:*?/\\')[:31]
+
+def _ecrire_set(feuille_excel, formats: dict, nom_g: str, nom_d: str, df_g: pd.DataFrame, df_d: pd.DataFrame):
+    """Écrit un set dans l'ordre des lignes (mode constant_memory) : noms, en-têtes I à VI puis les cases bordées."""
+    debut_droite = df_g.shape[1] + ECART_TABLEAUX
+    feuille_excel.set_column(0, debut_droite + df_d.shape[1], 12)
+    feuille_excel.write(0, 0, f" {nom_g}", formats['equipe'])
+    feuille_excel.write(0, debut_droite, f" {nom_d}", formats['equipe'])
+
+    for debut, df in ((0, df_g), (debut_droite, df_d)):
+        entetes = COLONNES_VOLLEY if df.shape[1] == 6 else [str(c) for c in df.columns]
+        feuille_excel.write_row(2, debut, entetes, formats['entete'])
+    # Cases converties une fois (None pour les cases vides : bordées mais sans valeur), puis écrites ligne à ligne
+    grilles = [(debut, np.where(pd.isna(df), None, df).astype(object)) for debut, df in ((0, df_g), (debut_droite, df_d))]
+    for ligne in range(max(len(df_g), len(df_d))):
+        for debut, grille in grilles:
+            if ligne < len(grille):
+                feuille_excel.write_row(3 + ligne, debut, grille[ligne], formats['case'])
+
+def _chemin_partie(cible: str, partie: int) -> str:
+    """Fichier de la partie n d'un classeur découpé : <cible>, puis <racine>_2.xlsx, <racine>_3.xlsx..."""
+    if partie == 1:
+        return cible
+    racine, extension = os.path.splitext(cible)
+    return f"{racine}_{partie}{extension}"
+
+def _ouvrir_classeur(chemin: str) -> dict:
+    """Nouveau classeur constant_memory avec ses formats et ses onglets 'Matchs' et 'Chronologie' (en-têtes écrits)."""
+    import xlsxwriter
+
+    classeur = xlsxwriter.Workbook(chemin, {'constant_memory': True, 'strings_to_numbers': True})
+    formats = {
+        'entete': classeur.add_format({'bold': True, 'bg_color': '#D7E4BC', 'border': 1, 'align': 'center'}),
+        'equipe': classeur.add_format({'bold': True, 'font_size': 14, 'font_color': '#1E4E79'}),
+        'case': classeur.add_format({'border': 1, 'align': 'center', 'valign': 'vcenter'}),
+    }
+    sommaire = classeur.add_worksheet('Matchs')
+    sommaire.write_row(0, 0, ['Match', 'Date', 'Équipe A', 'Équipe B', 'Sets A', 'Sets B'], formats['entete'])
+    sommaire.set_column(0, 5, 16)
+    chronologie = classeur.add_worksheet('Chronologie')
+    chronologie.write_row(0, 0, ['match', 'set', *DTYPE_CHRONOLOGIE.names], formats['entete'])
+    return {'classeur': classeur, 'formats': formats, 'sommaire': sommaire, 'chronologie': chronologie,
+            'ligne_sommaire': 1, 'ligne_chrono': 1, 'onglets_sets': 0}
+
+def ecrire_classeur_matchs(matchs, cible: str, prefixer: bool = True,
+                           onglets_max: int = ONGLETS_MAX_CLASSEUR) -> list:
+    """
+    Écrit un classeur de plusieurs matchs dans le fichier `cible`, en mode constant_memory de xlsxwriter :
+    chaque ligne part sur le disque dès que la suivante commence, et `matchs` (itérable de matchs analysés,
+    par exemple un générateur) est consommé un match à la fois ; la mémoire ne dépend pas du nombre de matchs.
+    Onglets : 'Matchs' (sommaire), un onglet par set ('M<i> Set <n>', ou 'Set <n>' sans `prefixer`) et 'Chronologie'.
+    xlsxwriter garde un fichier temporaire ouvert par onglet jusqu'à la fermeture du classeur : au-delà de
+    `onglets_max` onglets de sets (None : sans limite), la suite part dans <racine>_2.xlsx, <racine>_3.xlsx...
+    (chacun avec ses onglets 'Matchs' et 'Chronologie'). Renvoie la liste des fichiers écrits.
+    """
+    fichiers, partie = [], None
+    try:
+        for i, match in enumerate(matchs, start=1):
+            feuille = match['feuille']
+            equipe_a, equipe_b = match['equipes']
+            if partie is None or (onglets_max is not None and partie['onglets_sets']
+                                  and partie['onglets_sets'] + len(match['sets']) > onglets_max):
+                if partie is not None:
+                    partie['classeur'].close()
+                fichiers.append(_chemin_partie(cible, len(fichiers) + 1))
+                partie = _ouvrir_classeur(fichiers[-1])
+
+            sets_a, sets_b = feuille.sets_gagnes() if feuille is not None else ('', '')
+            partie['sommaire'].write_row(partie['ligne_sommaire'], 0,
+                                         [i, match.get('date') or '', equipe_a, equipe_b, sets_a, sets_b])
+            partie['ligne_sommaire'] += 1
+
+            for set_num, set_ in match['sets'].items():
+                # Alternance des côtés selon le set (comme à l'écran)
+                if set_num in [1, 3, 5]:
+                    gauche, droite = (equipe_a, set_['a']), (equipe_b, set_['b'])
+                else:
+                    gauche, droite = (equipe_b, set_['b']), (equipe_a, set_['a'])
+                nom = f"M{i} Set {set_num}" if prefixer else f"Set {set_num}"
+                onglet = partie['classeur'].add_worksheet(_nom_onglet(nom))
+                _ecrire_set(onglet, partie['formats'], gauche[0], droite[0], gauche[1], droite[1])
+                partie['onglets_sets'] += 1
+
+                chrono = feuille.chronologies.get(set_num) if feuille is not None else None
+                for point in ([] if chrono is None else chrono.tolist()):
+                    partie['chronologie'].write_row(partie['ligne_chrono'], 0, (i, set_num, *point))
+                    partie['ligne_chrono'] += 1
+        if partie is None:
+            # Aucun match : classeur vide (onglets 'Matchs' et 'Chronologie' seuls)
+            fichiers.append(cible)
+            partie = _ouvrir_classeur(cible)
+    finally:
+        if partie is not None:
+            partie['classeur'].close()
+    return fichiers
+
+def classeur_matchs(matchs, prefixer: bool = True) -> bytes:
+    """Contenu d'un classeur ecrire_classeur_matchs, passé par un fichier temporaire (téléchargement à la demande)."""
+    descripteur, temporaire = tempfile.mkstemp(suffix='.xlsx')
+    os.close(descripteur)
+    try:
+        ecrire_classeur_matchs(matchs, temporaire, prefixer, onglets_max=None)
+        with open(temporaire, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(temporaire)
+
+# ======================================================================
+# EXPORT PARQUET - Cases des sets, scores des sets et chronologie point par point
+# ======================================================================
+
+TABLES_PARQUET = ['sets', 'scores', 'chronologie']
+# Partitions du jeu de données de saison : les lignes des sets et des scores appartiennent à une équipe,
+# celles de la chronologie aux deux (partition par mois seulement)
+PARTITIONS_PARQUET = {'sets': ['equipe', 'mois'], 'scores': ['equipe', 'mois'], 'chronologie': ['mois']}
+
+def schemas_parquet() -> dict:
+    """Schémas Arrow fixes des trois tables (pyarrow n'est chargé qu'au premier export)."""
+    import pyarrow as pa
+
+    nom = pa.dictionary(pa.int32(), pa.string())
+    commun = [('match', pa.string()), ('date', pa.date32()), ('mois', pa.string()), ('set', pa.int8())]
+    return {
+        # Une ligne par case du tableau 12 x 6 (R0 formation, R1-R3 remplacements, R4-R11 scores) ;
+        # valeur VIDE (-1) ou CASE_X (-2) comme dans le modèle
+        'sets': pa.schema(commun + [('equipe', nom), ('adversaire', nom), ('cote', nom),
+                                    ('ligne', pa.int8()), ('colonne', pa.int8()), ('valeur', pa.int16())]),
+        # Une ligne par équipe et par set joué
+        'scores': pa.schema(commun + [('equipe', nom), ('adversaire', nom), ('points', pa.int16()),
+                                      ('points_adverses', pa.int16()), ('gagne', pa.bool_())]),
+        # Une ligne par point (champs de DTYPE_CHRONOLOGIE) et l'identité du serveur d'après les effectifs
+        'chronologie': pa.schema(commun + [('equipe_a', nom), ('equipe_b', nom)]
+                                 + [(champ, pa.from_numpy_dtype(DTYPE_CHRONOLOGIE[champ]))
+                                    for champ in DTYPE_CHRONOLOGIE.names]
+                                 + [('serveur_identite', nom)]),
+    }
+
+def _identites_serveurs(effectifs: dict, chronologie: np.ndarray) -> np.ndarray:
+    """Identité de chaque serveur (None si inconnue) : numéro et côté de l'équipe lus dans les effectifs."""
+    annuaire = np.full((2, 100), None, dtype=object)
+    joueurs = (effectifs or {}).get('joueurs')
+    if joueurs is not None:
+        for numero, identite, cote in joueurs[['Numero', 'Identite', 'Equipe']].itertuples(index=False):
+            if cote in ('A', 'B') and str(numero).isdigit() and int(numero) < 100:
+                annuaire['AB'.index(cote), int(numero)] = identite
+    serveur = chronologie['serveur'].astype(np.int64)
+    connus = (serveur >= 0) & (serveur < 100)
+    return np.where(connus, annuaire[chronologie['service'], np.where(connus, serveur, 0)], None)
+
+def tables_parquet(match: dict, sha256: str) -> dict:
+    """
+    Tables Arrow d'un match analysé, {nom: pyarrow.Table} aux schémas de schemas_parquet() ;
+    None si la feuille n'a pas de tableau des scores.
+    """
+    import pyarrow as pa
+
+    feuille = match['feuille']
+    if feuille is None:
+        return None
+    schemas = schemas_parquet()
+    date = datetime.date.fromisoformat(match['date']) if match.get('date') else None
+    mois = match['date'][:7] if match.get('date') else None
+    equipes = np.array(feuille.equipes, dtype=object)
+    sets_joues = [n for n in feuille.sets_joues if n in feuille.sets]
+
+    def commun(n: int, numeros_set) -> dict:
+        return {'match': [sha256] * n, 'date': [date] * n, 'mois': [mois] * n, 'set': numeros_set}
+
+    # Cases : (sets, 2 équipes, 12 lignes, 6 colonnes) aplaties d'un coup
+    grilles = np.array([[np.vstack([e.formation, e.remplacements, e.scores]) for e in feuille.sets[n]]
+                        for n in sets_joues], dtype=np.int16).reshape(-1, 2, 12, 6)
+    i_set, cote, ligne, colonne = np.indices(grilles.shape).reshape(4, -1)
+    sets = pa.Table.from_pydict({
+        **commun(i_set.size, np.array(sets_joues, dtype=np.int8)[i_set] if sets_joues else i_set),
+        'equipe': equipes[cote], 'adversaire': equipes[1 - cote], 'cote': np.array(['a', 'b'], dtype=object)[cote],
+        'ligne': ligne, 'colonne': colonne, 'valeur': grilles.ravel(),
+    }, schema=schemas['sets'])
+
+    # Scores : deux lignes par set joué (une par équipe, A puis B), null pour une case vide
+    points = feuille.scores_equipes[np.array(sets_joues, dtype=np.int64) - 1].astype(np.int16).reshape(-1, 2)
+    cote_s = np.tile([0, 1], len(sets_joues))
+    pour, contre = points.ravel(), points[:, ::-1].ravel()
+    scores = pa.Table.from_pydict({
+        **commun(cote_s.size, np.repeat(np.array(sets_joues, dtype=np.int8), 2)),
+        'equipe': equipes[cote_s], 'adversaire': equipes[1 - cote_s],
+        'points': pa.array(pour, mask=pour < 0), 'points_adverses': pa.array(contre, mask=contre < 0),
+        'gagne': pour > contre,
+    }, schema=schemas['scores'])
+
+    # Chronologie : les sets bout à bout, numéro de set répété sur chaque point
+    chronos = [feuille.chronologies.get(n, np.zeros(0, dtype=DTYPE_CHRONOLOGIE)) for n in sets_joues]
+    chrono = np.concatenate(chronos) if chronos else np.zeros(0, dtype=DTYPE_CHRONOLOGIE)
+    set_point = np.repeat(np.array(sets_joues, dtype=np.int8), [c.size for c in chronos])
+    chronologie = pa.Table.from_pydict({
+        **commun(chrono.size, set_point),
+        'equipe_a': [feuille.equipes[0]] * chrono.size, 'equipe_b': [feuille.equipes[1]] * chrono.size,
+        **{champ: chrono[champ] for champ in DTYPE_CHRONOLOGIE.names},
+        'serveur_identite': _identites_serveurs(match.get('effectifs'), chrono),
+    }, schema=schemas['chronologie'])
+    return {'sets': sets, 'scores': scores, 'chronologie': chronologie}
+
+def archive_parquet(match: dict, sha256: str) -> bytes:
+    """Les trois tables d'un match en fichiers Parquet réunis dans une archive zip (téléchargement) ; None sans scores."""
+    import pyarrow.parquet as pq
+
+    tables = tables_parquet(match, sha256)
+    if tables is None:
+        return None
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as archive:
+        for nom, table in tables.items():
+            tampon = io.BytesIO()
+            pq.write_table(table, tampon)
+            archive.writestr(f"{nom}.parquet", tampon.getvalue())
+    return output.getvalue()
+
+def ajouter_saison_parquet(match: dict, sha256: str, dossier: str) -> bool:
+    """
+    Ajoute le match au jeu de données de saison <dossier>/<table>/ partitionné (hive) selon PARTITIONS_PARQUET.
+    Les fichiers sont nommés d'après le SHA-256 : ré-exporter un match remplace ses fichiers au lieu de le dupliquer.
+    """
+    import pyarrow.dataset as ds
+
+    tables = tables_parquet(match, sha256)
+    if tables is None:
+        return False
+    for nom, table in tables.items():
+        ds.write_dataset(table, os.path.join(dossier, nom), format='parquet', partitioning=PARTITIONS_PARQUET[nom],
+                         partitioning_flavor='hive', basename_template=f"{sha256}-{{i}}.parquet",
+                         existing_data_behavior='overwrite_or_ignore')
+    return True
+
+def charger_saison_parquet(dossier: str, table: str, filtre=None) -> pd.DataFrame:
+    """
+    Charge une table du jeu de données de saison au schéma de schemas_parquet() (partitions comprises) ;
+    `filtre` est une expression pyarrow.dataset, appliquée à la lecture (partitions non lues).
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    schema = schemas_parquet()[table]
+    # Les dossiers de partition se lisent en texte (une partition sans date est nulle), puis reprennent leur type
+    cles = pa.schema([pa.field(cle, pa.string()) for cle in PARTITIONS_PARQUET[table]])
+    lecture = pa.schema([cles.field(champ.name) if champ.name in cles.names else champ for champ in schema])
+    jeu = ds.dataset(os.path.join(dossier, table), format='parquet', schema=lecture,
+                     partitioning=ds.partitioning(cles, flavor='hive'))
+    return jeu.to_table(filter=filtre).select(schema.names).cast(schema).to_pandas()
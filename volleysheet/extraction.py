@@ -0,0 +1,431 @@
+"""Extraction brute de la feuille de match PDF : backend tabula, gabarits, zones, en-tête et effectifs."""
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+MOTEURS_EXTRACTION = ['tabula', 'pdfplumber']
+BACKENDS_TABULA = ['jpype', 'subprocess']
+
+# ======================================================================
+# NOTIFICATIONS - Rappel branché par l'appelant (Streamlit, ligne de commande...)
+# ======================================================================
+
+NIVEAUX_JOURNAL = {'info': logging.INFO, 'succes': logging.INFO, 'erreur': logging.ERROR}
+
+def notifier_journal(niveau: str, message: str):
+    """Notification par défaut : le module logging (niveaux 'info', 'succes', 'erreur')."""
+    logging.getLogger('volleysheet').log(NIVEAUX_JOURNAL.get(niveau, logging.INFO), message)
+
+# ======================================================================
+# BACKEND TABULA : JVM persistante (jpype) ou sous-processus java
+# ======================================================================
+
+_mode_backend = None   # choisi une fois au démarrage (configurer_backend_tabula)
+_backend_actif = None
+_verrou_backend = threading.Lock()
+
+def configurer_backend_tabula(mode: str):
+    """Retient le backend tabula choisi au démarrage (option ou environnement), sans le lancer."""
+    global _mode_backend
+    if mode not in BACKENDS_TABULA:
+        raise ValueError(f"backend tabula inconnu : {mode} (attendu : {', '.join(BACKENDS_TABULA)})")
+    _mode_backend = mode
+
+def _demarrer_jvm_tabula():
+    """Démarre la JVM en processus (jpype) et charge les classes tabula une fois pour toutes."""
+    import jpype
+    import jpype.imports
+    from tabula.backend import jar_path
+
+    if not jpype.isJVMStarted():
+        jpype.addClassPath(jar_path())
+        jpype.startJVM("-Djava.awt.headless=true", "-Dfile.encoding=UTF8", convertStrings=False)
+    import technology.tabula  # noqa: F401 (chargement des classes = coût du premier appel)
+
+def demarrer_backend_tabula() -> dict:
+    """
+    Crée (une seule fois par processus) le backend tabula configuré, qui devient le backend actif.
+    En mode jpype, la JVM est préchauffée dans un thread ; en cas d'échec on bascule (journalisé) en sous-processus.
+    Erreur si aucun backend n'a été configuré : jamais de choix implicite.
+    """
+    global _backend_actif
+    with _verrou_backend:
+        if _backend_actif is not None:
+            return _backend_actif
+        if _mode_backend is None:
+            raise RuntimeError("backend tabula non configuré (configurer_backend_tabula au démarrage)")
+        mode = _mode_backend
+        backend = _backend_actif = {'mode': mode, 'pret': threading.Event()}
+
+        def prechauffer():
+            try:
+                _demarrer_jvm_tabula()
+            except Exception as e:
+                logging.getLogger(__name__).warning("JVM jpype indisponible, repli sur le sous-processus java : %s", e)
+                backend['mode'] = 'subprocess'
+            finally:
+                backend['pret'].set()
+
+        if mode == 'jpype':
+            threading.Thread(target=prechauffer, name='tabula-jvm', daemon=True).start()
+        else:
+            backend['pret'].set()
+        return backend
+
+def ouvrir_pdf(pdf_source):
+    """Prépare la source d'un PDF pour un moteur : octets en mémoire -> flux relu depuis le début, chemin inchangé."""
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(pdf_source)
+    if hasattr(pdf_source, 'seek'):
+        pdf_source.seek(0)
+    return pdf_source
+
+def ouvrir_pdfplumber(pdf_source):
+    """Ouvre le PDF avec pdfplumber (importé ici, au premier PDF : il ne pèse pas sur le démarrage)."""
+    import pdfplumber
+    return pdfplumber.open(ouvrir_pdf(pdf_source))
+
+def lire_pdf_tabula(pdf_source, **options) -> list:
+    """Appelle tabula.read_pdf via le backend configuré (démarré au besoin ; attend la fin du préchauffage)."""
+    import tabula
+    backend = demarrer_backend_tabula()
+    backend['pret'].wait()
+    return tabula.read_pdf(ouvrir_pdf(pdf_source), force_subprocess=(backend['mode'] == 'subprocess'), **options)
+
+# ======================================================================
+# ZONES FIXES DE LA FEUILLE DE MATCH (Page 1)
+# ======================================================================
+
+# Coordonnées des zones : [Haut, Gauche, Bas, Droite]
+ZONES_EXTRACTION = {
+    'set_1_a': [80, 10, 170, 250],    # COORDINATES_TEAM_G
+    'set_1_b': [80, 240, 170, 460],   # COORDINATES_TEAM_D
+    'set_2_b': [80, 460, 170, 590],   # COORDINATES_SET_2_G
+    'set_2_a': [80, 590, 170, 850],   # COORDINATES_SET_2_D
+    'set_3_a': [170, 10, 260, 250],   # COORDINATES_SET_3_G
+    'set_3_b': [170, 240, 260, 470],  # COORDINATES_SET_3_D
+    'set_4_b': [170, 400, 260, 590],  # COORDINATES_SET_4_G
+    'set_4_a': [170, 580, 260, 860],  # COORDINATES_SET_4_D
+    'set_5_b': [280, 140, 360, 480],  # COORDINATES_SET_5 (b)
+    'set_5_a': [280, 0, 360, 200],    # COORDINATES_SET_5 (a)
+    'scores': [300, 140, 842, 595],   # COORD_SCORES
+}
+ZONE_EN_TETE = [0, 0, 210, 600]
+TOLERANCE_ZONE = 2.0
+
+# Réglages "lattice" de pdfplumber : les cellules sont délimitées par les traits du tableau
+PARAMETRES_LATTICE_PDFPLUMBER = {'vertical_strategy': 'lines', 'horizontal_strategy': 'lines'}
+
+# ======================================================================
+# GABARITS DE FEUILLE - Empreinte de la mise en page et zones calibrées
+# ======================================================================
+
+MOTS_REPERES = ('LIBEROS', 'Arbitres')
+PAS_EMPREINTE = 5  # en points : arrondi des positions pour absorber le bruit de rendu
+FICHIER_GABARITS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gabarits.json')
+
+# Coin haut-gauche [Haut, Gauche] des tableaux quadrillés de la feuille de référence, mesuré par _origine_tableaux
+# sur tests/feuilles/reference.pdf : toutes les calibrations se font par rapport à lui
+ORIGINE_REFERENCE = [90.0, 20.0]
+
+# Gabarit de référence : les zones fixes ci-dessus
+GABARIT_DEFAUT = {'nom': 'Référence', 'zones': ZONES_EXTRACTION, 'en_tete': ZONE_EN_TETE, 'origine': ORIGINE_REFERENCE}
+
+def _arrondir(valeur: float) -> int:
+    return int(round(valeur / PAS_EMPREINTE) * PAS_EMPREINTE)
+
+def empreinte_page(page) -> str:
+    """Empreinte bon marché de la mise en page : taille de la page 1 + position des mots repères ('-' si absent)."""
+    mots = page.extract_words()
+    reperes = []
+    for repere in MOTS_REPERES:
+        mot = next((m for m in mots if m['text'].startswith(repere)), None)
+        reperes.append(f"{repere}@-" if mot is None else f"{repere}@{_arrondir(mot['x0'])},{_arrondir(mot['top'])}")
+    return "|".join([f"{_arrondir(page.width)}x{_arrondir(page.height)}"] + reperes)
+
+def charger_gabarits(chemin: str = FICHIER_GABARITS) -> dict:
+    """Registre {empreinte: gabarit} des mises en page calibrées (vide si le fichier n'existe pas)."""
+    try:
+        with open(chemin, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def enregistrer_gabarits(gabarits: dict, chemin: str = FICHIER_GABARITS):
+    """Écrit le registre d'un bloc (fichier temporaire puis renommage)."""
+    with open(chemin + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(gabarits, f, ensure_ascii=False, indent=2)
+    os.replace(chemin + '.tmp', chemin)
+
+def identifier_gabarit(pdf_source, gabarits: dict) -> tuple:
+    """Calcule l'empreinte de la page 1 et renvoie (empreinte, gabarit) ; gabarit de référence si inconnue."""
+    try:
+        with ouvrir_pdfplumber(pdf_source) as pdf:
+            empreinte = empreinte_page(pdf.pages[0])
+    except Exception:
+        return None, GABARIT_DEFAUT
+    return empreinte, gabarits.get(empreinte, GABARIT_DEFAUT)
+
+def _origine_tableaux(page) -> list:
+    """Coin haut-gauche [Haut, Gauche] de l'ensemble des tableaux quadrillés, repérés par leurs traits."""
+    cadres = [table.bbox for table in page.find_tables(PARAMETRES_LATTICE_PDFPLUMBER)]
+    if not cadres:
+        return None
+    return [min(c[1] for c in cadres), min(c[0] for c in cadres)]
+
+def calibrer_gabarit(pdf_source, nom: str) -> tuple:
+    """
+    Outil de calibration (une fois par nouvelle mise en page) : mesure la position des tableaux d'après les traits
+    et décale les zones du gabarit de référence de l'écart à son origine mesurée.
+    Retourne (empreinte, gabarit) à ajouter au registre.
+    """
+    with ouvrir_pdfplumber(pdf_source) as pdf:
+        page = pdf.pages[0]
+        empreinte = empreinte_page(page)
+        origine = _origine_tableaux(page)
+    if origine is None:
+        raise ValueError("aucun tableau quadrillé trouvé en page 1")
+
+    reference = GABARIT_DEFAUT
+    decalage = (origine[0] - reference['origine'][0], origine[1] - reference['origine'][1])
+
+    def decaler(zone):
+        haut, gauche, bas, droite = zone
+        return [round(haut + decalage[0], 1), round(gauche + decalage[1], 1),
+                round(bas + decalage[0], 1), round(droite + decalage[1], 1)]
+
+    gabarit = {
+        'nom': nom,
+        'zones': {nom_zone: decaler(zone) for nom_zone, zone in reference['zones'].items()},
+        'en_tete': decaler(reference['en_tete']),
+        'origine': origine,
+    }
+    return empreinte, gabarit
+
+def version_gabarits(gabarits: dict) -> str:
+    """Change dès qu'un gabarit est ajouté ou modifié : sert à invalider les analyses en cache."""
+    return hashlib.sha1(json.dumps(gabarits, sort_keys=True).encode()).hexdigest()[:12]
+
+# ======================================================================
+# MOTEUR TABULA - Zones lues par groupes sans chevauchement
+# ======================================================================
+
+def _zone_contient(zone: list, table: dict) -> bool:
+    """Vérifie qu'une table tabula (JSON) est incluse dans une zone, à la tolérance près."""
+    haut, gauche, bas, droite = zone
+    return (table['top'] >= haut - TOLERANCE_ZONE and table['left'] >= gauche - TOLERANCE_ZONE
+            and table['bottom'] <= bas + TOLERANCE_ZONE and table['right'] <= droite + TOLERANCE_ZONE)
+
+def _zones_chevauchent(zone_1: list, zone_2: list) -> bool:
+    """Vrai si les deux zones ont une partie commune (des bords qui se touchent ne comptent pas)."""
+    return (max(zone_1[0], zone_2[0]) < min(zone_1[2], zone_2[2])
+            and max(zone_1[1], zone_2[1]) < min(zone_1[3], zone_2[3]))
+
+def _groupes_zones(zones: dict) -> list:
+    """
+    Répartit les zones en groupes sans chevauchement (dans l'ordre, chaque zone dans le premier groupe possible).
+    Tabula ne dit pas de quelle zone vient une table : dans un groupe, la seule zone qui la contient est la bonne.
+    """
+    groupes = []
+    for nom, zone in zones.items():
+        groupe = next((g for g in groupes if not any(_zones_chevauchent(zone, autre) for autre in g.values())), None)
+        if groupe is None:
+            groupe = {}
+            groupes.append(groupe)
+        groupe[nom] = zone
+    return groupes
+
+def _extraire_lignes_tabula(pdf_source, zones: dict) -> dict:
+    """
+    Lit les zones en un appel tabula (lattice) par groupe de zones disjointes (3 appels pour la feuille de
+    référence au lieu d'un par zone) et renvoie {nom de zone: lignes de texte}. Une table est rangée dans la zone
+    du groupe qui la contient : comme avec une lecture zone par zone, une zone qui en chevauche une autre
+    (scores et set 5, sets 3 et 4) garde toutes ses lignes.
+    """
+    lignes_par_zone = {nom: [] for nom in zones}
+    for groupe in _groupes_zones(zones):
+        tables = lire_pdf_tabula(pdf_source, pages=1, area=list(groupe.values()), lattice=True,
+                                 output_format='json')
+        for table in tables:
+            nom = next((nom for nom, zone in groupe.items() if _zone_contient(zone, table)), None)
+            if nom is not None and table.get('data'):
+                lignes_par_zone[nom].extend([cell['text'] for cell in row] for row in table['data'])
+    return lignes_par_zone
+
+# ======================================================================
+# MOTEUR PDFPLUMBER - Géométrie native du PDF (sans Java)
+# ======================================================================
+
+def _bbox_pdfplumber(zone: list, page) -> tuple:
+    """Convertit une zone tabula [Haut, Gauche, Bas, Droite] en bbox pdfplumber, bornée à la page."""
+    haut, gauche, bas, droite = zone
+    x0, top, x1, bottom = page.bbox
+    return (max(gauche, x0), max(haut, top), min(droite, x1), min(bas, bottom))
+
+def _extraire_lignes_pdfplumber(pdf_source, zones: dict) -> dict:
+    """Lit les mêmes zones avec les traits/rectangles/caractères de pdfplumber ; même forme que tabula."""
+    lignes_par_zone = {}
+    with ouvrir_pdfplumber(pdf_source) as pdf:
+        page = pdf.pages[0]
+        for nom, zone in zones.items():
+            tables = page.crop(_bbox_pdfplumber(zone, page)).extract_tables(PARAMETRES_LATTICE_PDFPLUMBER)
+            lignes_par_zone[nom] = [row for table in tables for row in table]
+    return lignes_par_zone
+
+EXTRACTEURS_ZONES = {
+    'tabula': _extraire_lignes_tabula,
+    'pdfplumber': _extraire_lignes_pdfplumber,
+}
+
+# ======================================================================
+# FONCTION D'EXTRACTION BRUTE - Toutes les zones (moteur au choix)
+# ======================================================================
+
+def _grille_depuis_lignes(lignes: list) -> pd.DataFrame:
+    """Reconstruit la grille brute d'une zone, comme la sortie CSV de tabula (header=None)."""
+    grille = pd.DataFrame([[texte or np.nan for texte in row] for row in lignes])
+
+    # Même inférence de type que pd.read_csv (les nombres deviennent '12.0' après astype(str))
+    for col in grille.columns:
+        try:
+            grille[col] = pd.to_numeric(grille[col])
+        except (ValueError, TypeError):
+            pass
+    return grille.fillna('').astype(str)
+
+def extract_raw_zones(pdf_source, moteur: str = 'tabula', gabarit: dict = GABARIT_DEFAUT,
+                      notifier=notifier_journal, en_tete: bool = True) -> dict:
+    """
+    Extrait toutes les zones du gabarit (page 1) avec le moteur choisi (quelques appels groupés pour tabula).
+    Retourne un dict {nom de zone: DataFrame brut ou None}, plus 'en_tete' (tables de l'en-tête) sauf si
+    `en_tete=False` (l'appelant l'extrait alors lui-même, en parallèle).
+    """
+    try:
+        lignes_par_zone = EXTRACTEURS_ZONES[moteur](pdf_source, gabarit['zones'])
+    except Exception as e:
+        notifier('erreur', f"❌ ERREUR lors de l'extraction {moteur} des zones : {e}")
+        lignes_par_zone = {}
+
+    grilles = {nom: (_grille_depuis_lignes(lignes_par_zone[nom]) if lignes_par_zone.get(nom) else None)
+               for nom in gabarit['zones']}
+
+    if grilles['scores'] is None:
+        notifier('erreur', "❌ Échec de la récupération du tableau pour DONNÉES.")
+    else:
+        notifier('succes', f"✅ Extraction des zones réussie ({sum(g is not None for g in grilles.values())}/{len(grilles)})")
+
+    # L'en-tête n'est pas un tableau quadrillé : il garde son mode d'extraction propre
+    if en_tete:
+        grilles['en_tete'] = extract_raw_nom_equipe(pdf_source, moteur, gabarit['en_tete'], notifier)
+    return grilles
+
+def comparer_moteurs(pdf_source, gabarit: dict = GABARIT_DEFAUT, notifier=notifier_journal) -> tuple:
+    """Banc d'essai : extrait la feuille avec chaque moteur, compare les grilles zone par zone et chronomètre."""
+    grilles, durees = {}, {}
+    for moteur in MOTEURS_EXTRACTION:
+        debut = time.perf_counter()
+        grilles[moteur] = extract_raw_zones(pdf_source, moteur, gabarit, notifier)
+        durees[moteur] = time.perf_counter() - debut
+
+    lignes = []
+    for nom in gabarit['zones']:
+        g_ref, g_alt = grilles['tabula'][nom], grilles['pdfplumber'][nom]
+        lignes.append({
+            'Zone': nom,
+            'Taille tabula': 'vide' if g_ref is None else f"{g_ref.shape[0]}x{g_ref.shape[1]}",
+            'Taille pdfplumber': 'vide' if g_alt is None else f"{g_alt.shape[0]}x{g_alt.shape[1]}",
+            'Identique': (g_ref is None and g_alt is None) or (g_ref is not None and g_alt is not None
+                                                               and g_ref.reset_index(drop=True).equals(g_alt.reset_index(drop=True))),
+        })
+    return pd.DataFrame(lignes), durees
+
+# ======================================================================
+# EN-TÊTE - Extraction brute (noms des équipes)
+# ======================================================================
+def extract_raw_nom_equipe(pdf_source, moteur='tabula', zone=ZONE_EN_TETE, notifier=notifier_journal):
+    """Extrait les tableaux du quart supérieur (page 1) pour identifier les noms."""
+    if moteur == 'pdfplumber':
+        try:
+            with ouvrir_pdfplumber(pdf_source) as pdf:
+                page = pdf.pages[0]
+                tables = page.crop(_bbox_pdfplumber(zone, page)).extract_tables()
+            return [pd.DataFrame(table) for table in tables if table]
+        except Exception as e:
+            notifier('erreur', f"❌ Erreur lors de l'extraction de l'en-tête : {e}")
+            return None
+    try:
+        liste_tables = lire_pdf_tabula(
+            pdf_source,
+            pages=1,
+            area=zone,
+            multiple_tables=True,
+            pandas_options={'header': None}
+        )
+        return liste_tables
+    except Exception as e:
+        notifier('erreur', f"❌ Erreur lors de l'extraction de l'en-tête : {e}")
+        return None
+
+# ======================================================================
+# FONCTIONS D'EXTRACTION DES JOUEURS, LIBEROS ET STAFF (un seul passage)
+# ======================================================================
+MOTIF_JOUEUR = re.compile(r'(\d{2})\s+([A-ZÀ-ÿ\s\-]+?)\s+(\d{5,7})')
+MOTIF_STAFF = re.compile(r'(E[ABC])\s+([A-ZÀ-ÿ\s\-]+?)\s+(\d{5,7})')
+ECART_MIN_COLONNES = 100  # en points : en dessous, on ne distingue pas deux colonnes d'équipes
+
+def _cotes_equipes(abscisses: list) -> list:
+    """Attribue l'équipe (A à gauche, B à droite) selon la colonne ; None si une seule colonne est détectée."""
+    if not abscisses or max(abscisses) - min(abscisses) < ECART_MIN_COLONNES:
+        return [None] * len(abscisses)
+    milieu = (min(abscisses) + max(abscisses)) / 2
+    return ['A' if x < milieu else 'B' for x in abscisses]
+
+def _extraire_section(motif, texte, abscisses, debut, fin, colonne_code) -> pd.DataFrame:
+    """Applique un motif entre deux positions du texte et renvoie le DataFrame (avec le côté de l'équipe)."""
+    matches = list(motif.finditer(texte, debut, fin))
+    cotes = _cotes_equipes([abscisses[m.start()] for m in matches])
+    donnees = [{colonne_code: m.group(1), "Identite": m.group(2).strip(), "Licence": m.group(3), "Equipe": cote}
+               for m, cote in zip(matches, cotes)]
+    return pd.DataFrame(donnees, columns=[colonne_code, "Identite", "Licence", "Equipe"]).drop_duplicates(subset=['Licence'])
+
+def extraire_effectifs(pdf_source) -> dict:
+    """
+    Extrait joueurs (avant LIBEROS), liberos (entre LIBEROS et Arbitres) et staff EA/EB/EC (après Arbitres)
+    en ouvrant le PDF une seule fois ; la lecture s'arrête à la page qui contient la section Arbitres.
+    Retourne {'joueurs', 'liberos', 'staff'}, chaque ligne portant son équipe (A/B) d'après sa colonne.
+    """
+    morceaux, abscisses = [], []
+    try:
+        with ouvrir_pdfplumber(pdf_source) as pdf:
+            for page in pdf.pages:
+                carte = page.get_textmap()
+                morceaux.append(carte.as_string)
+                abscisses.extend(char['x0'] if char else None for _, char in carte.tuples)
+                if "Arbitres" in carte.as_string:
+                    break
+    except Exception:
+        morceaux, abscisses = [], []
+    texte = "".join(morceaux)
+
+    # Repérage des sections une seule fois
+    i_liberos = texte.find("LIBEROS")
+    fin_joueurs = i_liberos if i_liberos >= 0 else len(texte)
+    i_arbitres = texte.find("Arbitres", max(i_liberos, 0))
+
+    effectifs = {'joueurs': _extraire_section(MOTIF_JOUEUR, texte, abscisses, 0, fin_joueurs, "Numero")}
+    if i_liberos >= 0:
+        fin_liberos = i_arbitres if i_arbitres >= 0 else len(texte)
+        effectifs['liberos'] = _extraire_section(MOTIF_JOUEUR, texte, abscisses, i_liberos + len("LIBEROS"), fin_liberos, "Numero")
+    else:
+        effectifs['liberos'] = _extraire_section(MOTIF_JOUEUR, texte, abscisses, 0, 0, "Numero")
+    debut_staff = i_arbitres + len("Arbitres") if i_arbitres >= 0 else len(texte)
+    effectifs['staff'] = _extraire_section(MOTIF_STAFF, texte, abscisses, debut_staff, len(texte), "Code")
+    return effectifs
@@ -0,0 +1,180 @@
+"""
+Graphiques matplotlib : duel chronologique d'un set et rotations ; chaque fonction renvoie sa figure.
+Les figures sont créées hors de pyplot, directement sur un canevas Agg : aucun état global, rien à fermer.
+"""
+import io
+import threading
+
+import numpy as np
+import matplotlib as mpl
+import matplotlib.patches as patches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import TICKDOWN, TICKLEFT, Line2D
+from matplotlib.transforms import offset_copy
+
+from volleysheet.rotations import format_stats, obtenir_rotation_positions, passages_rotation, stats_rotations
+from volleysheet.structure import TeamSet
+from volleysheet.vega import COULEUR_D, COULEUR_G, donnees_duel
+
+# Streamlit réduit toute image plus large que sa zone de contenu (1460 px) à chaque affichage : on rend
+# directement à cette largeur (200 dpi au plus, comme st.pyplot), l'image en cache est servie telle quelle.
+LARGEUR_MAX_PNG = 1460
+DPI_MAX_PNG = 200
+
+# matplotlib n'est pas sûr entre threads (page et préchargement) : un tracé à la fois
+_VERROU_TRACE = threading.Lock()
+
+def nouvelle_figure(figsize: tuple) -> Figure:
+    """Figure rendue par Agg, sans passer par pyplot (libérée par le ramasse-miettes comme tout objet)."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def figure_png(fig) -> bytes:
+    """Rend la figure en PNG (None si pas de figure)."""
+    if fig is None:
+        return None
+    tampon = io.BytesIO()
+    fig.savefig(tampon, format='png', bbox_inches='tight', dpi=min(DPI_MAX_PNG, LARGEUR_MAX_PNG / fig.get_figwidth()))
+    return tampon.getvalue()
+
+def graphique_png(tracer, *args, **kwargs) -> bytes:
+    """Trace `tracer(*args, **kwargs)` et le rend en PNG."""
+    with _VERROU_TRACE:
+        return figure_png(tracer(*args, **kwargs))
+
+# ======================================================================
+# FONCTION Graph Set - Duel Chronologique
+# ======================================================================
+
+def _graduations(ax, axe: str, positions: np.ndarray, libelles: list, couleurs, **style_texte):
+    """
+    Graduations tracées comme celles de matplotlib (mêmes longueur, épaisseur et écart du libellé), mais avec
+    un seul Line2D pour toutes les marques et un simple texte par libellé : les objets Tick coûtent à eux seuls
+    plus que tout le reste du graphique.
+    """
+    reglages = {cle: mpl.rcParams[f'{axe}tick.major.{cle}'] for cle in ('size', 'width', 'pad')}
+    ecart = reglages['size'] + reglages['pad']
+    zeros = np.zeros(len(positions))
+    if axe == 'x':
+        transformation, x, y, marqueur = ax.get_xaxis_transform(), positions, zeros, TICKDOWN
+        decalage, alignement = {'y': -ecart}, {'ha': 'center', 'va': 'top'}
+    else:
+        transformation, x, y, marqueur = ax.get_yaxis_transform(), zeros, positions, TICKLEFT
+        decalage, alignement = {'x': -ecart}, {'ha': 'right', 'va': 'center_baseline'}
+    getattr(ax, f'set_{axe}ticks')([])
+
+    ax.add_line(Line2D(x, y, transform=transformation, linestyle='none', marker=marqueur, markersize=reglages['size'],
+                       markeredgewidth=reglages['width'], color=mpl.rcParams[f'{axe}tick.color'], clip_on=False))
+    transformation_textes = offset_copy(transformation, ax.figure, units='points', **decalage)
+    for xi, yi, libelle, couleur in zip(x.tolist(), y.tolist(), libelles, np.broadcast_to(couleurs, len(libelles))):
+        ax.text(xi, yi, libelle, transform=transformation_textes, color=couleur, clip_on=False, **alignement,
+                **style_texte)
+
+def tracer_duel_equipes(equipe_g: TeamSet, equipe_d: TeamSet, titre="Duel", nom_g="Équipe A", nom_d="Équipe B",
+                        chronologie: np.ndarray = None):
+    """
+    Génère le graphique en barres de l'évolution du score en ignorant les 'X' ; renvoie la figure (ou None).
+    Mise en page partagée avec le rendu Vega (donnees_duel) : toutes les barres dans une seule collection,
+    de même pour les séparateurs et pour les marques des graduations.
+    """
+    if equipe_g is None or equipe_d is None:
+        return None
+    duel = donnees_duel(equipe_g, equipe_d, chronologie)
+    barres, sequences = duel['barres'], duel['sequences']
+    couleurs = np.array([COULEUR_G, COULEUR_D])
+
+    fig = nouvelle_figure((22, 10))
+    ax = fig.subplots()
+
+    # Barres de largeur 0.4 centrées sur leur position : un seul artiste pour tout le set
+    gauche, droite = barres['x'] - 0.2, barres['x'] + 0.2
+    bas, haut = barres['bas'], barres['bas'] + barres['hauteur']
+    sommets = np.stack([np.column_stack(coins) for coins in ((gauche, bas), (gauche, haut), (droite, haut),
+                                                              (droite, bas))], axis=1)
+    ax.add_collection(PolyCollection(sommets, facecolors=couleurs[barres['equipe']], edgecolors='black',
+                                     joinstyle='miter'))
+    x_min, x_max = ax.get_xlim()
+
+    # Nom de chaque séquence sous l'axe et ligne séparatrice à sa fin (une seule LineCollection)
+    for debut, fin, nom in zip(sequences['debut'], sequences['fin'], sequences['nom']):
+        ax.text((debut + fin) / 2, -3.2, nom, ha='center', va='top', fontsize=11, fontweight='bold', color='#555555')
+    separations = sequences['fin'] + 0.5
+    ax.vlines(separations, 0, 35, colors='black', linestyles='-', alpha=0.15, capstyle='projecting')
+
+    # Axe horizontal : les barres, élargi aux séparateurs seulement s'ils en sortent (comme axvline), puis à
+    # toutes les positions (comme set_xticks)
+    if ((separations >= x_min) & (separations <= x_max)).all():
+        ax.set_xlim(x_min, x_max)
+    n = len(duel['libelles'])
+    if n:
+        x_min, x_max = ax.get_xlim()
+        ax.set_xlim(min(x_min, 0), max(x_max, n - 1))
+
+    # Numéro du serveur sous chaque position, à la couleur de son équipe
+    _graduations(ax, 'x', np.arange(n), duel['libelles'], couleurs[duel['equipes']], fontsize=10, fontweight='bold')
+    ax.set_ylim(0, 35)
+    _graduations(ax, 'y', np.arange(36), [str(v) for v in range(36)], mpl.rcParams['ytick.color'],
+                 fontsize=mpl.rcParams['ytick.labelsize'])
+
+    custom_lines = [Line2D([0], [0], color=COULEUR_G, lw=4), Line2D([0], [0], color=COULEUR_D, lw=4)]
+    ax.legend(custom_lines, [nom_g, nom_d], loc='upper left', fontsize=12)
+    ax.set_title(titre, fontsize=16, fontweight='bold', pad=25)
+    fig.subplots_adjust(bottom=0.2)
+    return fig
+
+# ======================================================================
+# FONCTIONS GRAPHIQUES ET CALCULS
+# ======================================================================
+def dessiner_rotation_couleurs(ax, nom_a, pos_a, nom_b, pos_b, serveur='A'):
+    """Dessine le terrain avec les positions des joueurs."""
+    ax.add_patch(patches.Rectangle((0, 0), 18, 9, linewidth=2, edgecolor='black', facecolor='#fafafa'))
+    ax.plot([9, 9], [0, 9], color='black', linewidth=3) # Filet
+
+    color_a, color_b = 'royalblue', 'darkorange'
+    coords_a = {'IV': (7.5, 7.5), 'III': (7.5, 4.5), 'II': (7.5, 1.5), 'V': (3.0, 7.5), 'VI': (3.0, 4.5), 'I': (3.0, 1.5)}
+    coords_b = {'II': (10.5, 7.5), 'III': (10.5, 4.5), 'IV': (10.5, 1.5), 'I': (15.0, 7.5), 'VI': (15.0, 4.5), 'V': (15.0, 1.5)}
+
+    if serveur == 'A':
+        ax.text(-1.5, 1.5, str(pos_a['I']), fontsize=22, weight='bold', color=color_a, ha='center')
+        for p, n in pos_b.items(): ax.text(coords_b[p][0], coords_b[p][1], str(n), fontsize=20, weight='bold', color=color_b, ha='center', va='center')
+        for p, n in pos_a.items():
+            if p != 'I': ax.text(coords_a[p][0], coords_a[p][1], str(n), fontsize=20, weight='bold', color=color_a, ha='center', va='center')
+    else:
+        ax.text(19.5, 7.5, str(pos_b['I']), fontsize=22, weight='bold', color=color_b, ha='center')
+        for p, n in pos_a.items(): ax.text(coords_a[p][0], coords_a[p][1], str(n), fontsize=20, weight='bold', color=color_a, ha='center', va='center')
+        for p, n in pos_b.items():
+            if p != 'I': ax.text(coords_b[p][0], coords_b[p][1], str(n), fontsize=20, weight='bold', color=color_b, ha='center', va='center')
+    ax.set_xlim(-3, 21); ax.set_ylim(-1, 10); ax.axis('off')
+
+def figure_rotations(equipe_a: TeamSet, equipe_b: TeamSet, nom_g: str, nom_d: str):
+    """Figure 6 x 2 : pour chaque rotation, le terrain et les points marqués / encaissés de chaque équipe."""
+    base_a, base_b = equipe_a.numeros(), equipe_b.numeros()
+    stats_a = stats_rotations(equipe_a, equipe_b)
+    fig = nouvelle_figure((18, 45))
+    axes = fig.subplots(6, 2)
+
+    for idx_col in range(6):
+        m_a, e_a = passages_rotation(stats_a, idx_col)
+        m_b, e_b = e_a, m_a
+
+        # Rendu Graphique Gauche (Équipe A)
+        rot_a_g = obtenir_rotation_positions(base_a, idx_col, doit_tourner=False)
+        rot_b_g = obtenir_rotation_positions(base_b, idx_col, doit_tourner=False)
+        dessiner_rotation_couleurs(axes[idx_col, 0], nom_g, rot_a_g, nom_d, rot_b_g, serveur='A')
+
+        tm_a, te_a, td_a, tot_ma, tot_ea = format_stats(m_a, e_a)
+        axes[idx_col, 0].text(1, -1.5, f"pts marqués\n{tm_a}\n\nTotal: {tot_ma}", color='royalblue', va='top', family='monospace')
+        axes[idx_col, 0].text(7, -1.5, f"pts encaissés\n{te_a}\n\nTotal: {tot_ea}", color='salmon', va='top', family='monospace')
+        axes[idx_col, 0].text(13, -1.5, f"différence\n{td_a}\n\nTotal: {tot_ma-tot_ea:+d}", color='black', weight='bold', va='top', family='monospace')
+
+        # Rendu Graphique Droite (Équipe B)
+        dessiner_rotation_couleurs(axes[idx_col, 1], nom_g, rot_a_g, nom_d, rot_b_g, serveur='B')
+        tm_b, te_b, td_b, tot_mb, tot_eb = format_stats(m_b, e_b)
+        axes[idx_col, 1].text(1, -1.5, f"pts marqués\n{tm_b}\n\nTotal: {tot_mb}", color='darkorange', va='top', family='monospace')
+        axes[idx_col, 1].text(7, -1.5, f"pts encaissés\n{te_b}\n\nTotal: {tot_eb}", color='royalblue', va='top', family='monospace')
+        axes[idx_col, 1].text(13, -1.5, f"différence\n{td_b}\n\nTotal: {tot_mb-tot_eb:+d}", color='black', weight='bold', va='top', family='monospace')
+
+    return fig
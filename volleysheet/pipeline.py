@@ -0,0 +1,122 @@
+"""Chaîne complète d'analyse d'une feuille : gabarit, zones, structure, modèle typé et effectifs."""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from volleysheet.chronologie import construire_chronologie
+from volleysheet.extraction import (GABARIT_DEFAUT, extract_raw_nom_equipe, extract_raw_zones, extraire_effectifs,
+                                    identifier_gabarit, notifier_journal)
+from volleysheet.structure import (VIDE, MatchSheet, TeamSet, extraire_date_match, extraire_temps_morts,
+                                   grille_entiers, process_and_structure_noms_equipes, process_and_structure_scores,
+                                   structurer_zone)
+
+# Étapes chronométrées : le gabarit, puis en parallèle l'en-tête, les zones et les effectifs ; la structure
+# attend l'en-tête et les zones
+ETAPES = ['gabarit', 'en_tete', 'zones', 'structure', 'effectifs']
+
+def nouveau_match() -> dict:
+    """Analyse vide : toutes les clés sont présentes dès le départ et remplies au fil des étapes."""
+    return {
+        'gabarit': None,
+        'zones': {},
+        'equipes': None,
+        'date': None,
+        'scores': None,
+        'sets': {},
+        'effectifs': None,
+        'feuille': None,
+        'durees': {},
+    }
+
+def _structurer(match: dict, notifier):
+    """Scores, sets joués, temps morts et modèle typé, depuis les zones brutes et les noms d'équipes."""
+    raw_zones = match['zones']
+    if raw_zones['scores'] is None:
+        return
+    match['scores'] = process_and_structure_scores(raw_zones['scores'], notifier)
+    scores_sets = grille_entiers(match['scores'].to_numpy(dtype=object))
+    sets_match = {}
+    for set_num in range(1, 6):
+        if scores_sets[set_num - 1, 0] == VIDE:
+            continue
+        sets_match[set_num] = {
+            'a': structurer_zone(raw_zones[f'set_{set_num}_a'], f'set_{set_num}_a'),
+            'b': structurer_zone(raw_zones[f'set_{set_num}_b'], f'set_{set_num}_b'),
+            'temps_morts': extraire_temps_morts(raw_zones, set_num),
+        }
+    match['sets'] = sets_match
+    match['feuille'] = construire_feuille(match)
+
+def construire_feuille(match: dict) -> MatchSheet:
+    """
+    Modèle typé construit une seule fois depuis les scores et les sets structurés : toutes les analyses et
+    graphiques le lisent. Sert aussi à le reconstruire pour une analyse relue depuis le stockage.
+    """
+    if match['scores'] is None:
+        return None
+    sets = {n: (TeamSet.depuis_tableau(s['a'], s['temps_morts']['a']),
+                TeamSet.depuis_tableau(s['b'], s['temps_morts']['b'])) for n, s in match['sets'].items()}
+    return MatchSheet(
+        equipes=match['equipes'],
+        scores_sets=grille_entiers(match['scores'].to_numpy(dtype=object)),
+        sets=sets,
+        chronologies={n: construire_chronologie(*equipes) for n, equipes in sets.items()},
+    )
+
+def _chronometrer(etape: str, fonction, *args, **kwargs) -> tuple:
+    debut = time.perf_counter()
+    resultat = fonction(*args, **kwargs)
+    return etape, resultat, time.perf_counter() - debut
+
+def analyser_feuille(pdf_bytes: bytes, moteur: str = 'tabula', gabarits: dict = None,
+                     notifier=notifier_journal, progression=None, match: dict = None) -> dict:
+    """
+    Extrait et structure toute la feuille : zones brutes, noms d'équipes, date, scores, sets joués, temps morts
+    et effectifs. Une fois le gabarit connu, l'en-tête, les zones et les effectifs sont extraits en parallèle.
+    Sans dépendance à l'interface : les messages passent par `notifier(niveau, message)` (appelé depuis les
+    threads d'extraction) et, si fourni, `progression(etape, faites, total)` est appelé dans le thread appelant
+    à la fin de chaque étape, dans l'ordre où elles se terminent.
+    Si `match` (voir nouveau_match) est fourni, il est rempli au fur et à mesure : un autre thread peut afficher
+    l'en-tête ou les sets avant la fin. La durée de chaque étape (secondes) est rangée dans match['durees'].
+    """
+    match = nouveau_match() if match is None else match
+    durees = match['durees']
+
+    def etape_terminee(etape: str, duree: float):
+        durees[etape] = duree
+        if progression is not None:
+            progression(etape, len(durees), len(ETAPES))
+
+    # Gabarit de la feuille : recherche directe par empreinte, sans extraction d'essai
+    debut = time.perf_counter()
+    empreinte, gabarit = identifier_gabarit(pdf_bytes, gabarits or {})
+    if gabarit is GABARIT_DEFAUT:
+        notifier('info', "ℹ️ Mise en page non répertoriée : zones de référence utilisées.")
+    match['gabarit'] = {'empreinte': empreinte, **gabarit}
+    etape_terminee('gabarit', time.perf_counter() - debut)
+
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix='extraction') as pool:
+        taches = [
+            pool.submit(_chronometrer, 'en_tete', extract_raw_nom_equipe, pdf_bytes, moteur, gabarit['en_tete'],
+                        notifier),
+            pool.submit(_chronometrer, 'zones', extract_raw_zones, pdf_bytes, moteur, gabarit, notifier,
+                        en_tete=False),
+            pool.submit(_chronometrer, 'effectifs', extraire_effectifs, pdf_bytes),
+        ]
+        for tache in as_completed(taches):
+            etape, resultat, duree = tache.result()
+            if etape == 'en_tete':
+                match['zones']['en_tete'] = resultat
+                match['equipes'] = process_and_structure_noms_equipes(match['zones'])
+                match['date'] = extraire_date_match(match['zones'])
+            elif etape == 'zones':
+                # L'en-tête reste en dernière position, comme quand extract_raw_zones lit aussi l'en-tête
+                match['zones'] = {**resultat, 'en_tete': match['zones'].get('en_tete')}
+            else:
+                match['effectifs'] = resultat
+            etape_terminee(etape, duree)
+
+            if 'structure' not in durees and 'en_tete' in durees and 'zones' in durees:
+                debut = time.perf_counter()
+                _structurer(match, notifier)
+                etape_terminee('structure', time.perf_counter() - debut)
+    return match
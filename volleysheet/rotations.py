@@ -0,0 +1,95 @@
+"""Analyse des rotations : positions I-VI et points marqués / encaissés par passage au service."""
+import numpy as np
+
+from volleysheet.structure import VIDE, MatchSheet, TeamSet
+
+def obtenir_rotation_positions(base_joueurs, index_rotation, doit_tourner=False):
+    """Calcule les positions I-VI. Si doit_tourner est True, on applique la rotation (+1)."""
+    # Si l'équipe récupère le service, elle tourne : l'index de départ se décale de 1
+    idx = (index_rotation + 1) % 6 if doit_tourner else index_rotation % 6
+
+    return {
+        'I':   base_joueurs[idx],
+        'II':  base_joueurs[(idx + 1) % 6],
+        'III': base_joueurs[(idx + 2) % 6],
+        'IV':  base_joueurs[(idx + 3) % 6],
+        'V':   base_joueurs[(idx + 4) % 6],
+        'VI':  base_joueurs[(idx + 5) % 6]
+    }
+
+# ======================================================================
+# MOTEUR VECTORISÉ - Points marqués / encaissés par rotation
+# ======================================================================
+
+NB_ROTATIONS = 6
+
+def _points_par_service(points: np.ndarray) -> np.ndarray:
+    """
+    Points gagnés à chaque tour de service : différences successives du score cumulé lu en serpentin
+    (RnCn - RnCn-1, ou RnC0 - Rn-1C5 en début de ligne), en un seul np.diff.
+    """
+    serpentin = points.reshape(*points.shape[:-2], -1)
+    return np.diff(serpentin, axis=-1, prepend=0).reshape(points.shape)
+
+def calculer_stats_rotations(scores, scores_adverses) -> dict:
+    """
+    Statistiques des six rotations depuis les grilles de scores cumulés (..., 8, 6) d'une équipe et de son adversaire ;
+    les dimensions de tête permettent d'empiler un set, un match ou une saison et de tout calculer d'un coup.
+    Retourne par passage (..., 8, 6) 'marques', 'encaisses' et 'joues', et par rotation (..., 6)
+    'total_marques', 'total_encaisses' et 'differentiel'.
+    """
+    scores = np.asarray(scores, dtype=np.int64)
+    scores_adverses = np.asarray(scores_adverses, dtype=np.int64)
+
+    # Un passage compte tant que la colonne de la rotation n'a pas rencontré de case vide
+    joues = np.logical_and.accumulate(scores != VIDE, axis=-2)
+    marques = np.where(joues, _points_par_service(np.where(scores >= 0, scores, 0)), 0)
+    encaisses = np.where(joues, _points_par_service(np.where(scores_adverses >= 0, scores_adverses, 0)), 0)
+
+    # Regroupement par rotation (et par grille empilée) avec une seule bincount
+    nb_grilles = marques.size // marques.shape[-1] // marques.shape[-2]
+    groupes = np.arange(nb_grilles)[:, None, None] * NB_ROTATIONS + np.arange(NB_ROTATIONS)  # (grilles, 1, 6)
+    groupes = np.broadcast_to(groupes, (nb_grilles,) + marques.shape[-2:]).ravel()
+    forme_totaux = marques.shape[:-2] + (NB_ROTATIONS,)
+    total_marques = np.bincount(groupes, weights=marques.ravel(), minlength=nb_grilles * NB_ROTATIONS)
+    total_encaisses = np.bincount(groupes, weights=encaisses.ravel(), minlength=nb_grilles * NB_ROTATIONS)
+    total_marques = total_marques.astype(np.int64).reshape(forme_totaux)
+    total_encaisses = total_encaisses.astype(np.int64).reshape(forme_totaux)
+
+    return {
+        'marques': marques, 'encaisses': encaisses, 'joues': joues,
+        'total_marques': total_marques, 'total_encaisses': total_encaisses,
+        'differentiel': total_marques - total_encaisses,
+    }
+
+def stats_rotations(equipe: TeamSet, adversaire: TeamSet) -> dict:
+    """Statistiques des six rotations d'une équipe sur un set."""
+    return calculer_stats_rotations(equipe.scores, adversaire.scores)
+
+def stats_rotations_match(feuille: MatchSheet) -> dict:
+    """Toutes les rotations des deux équipes sur tous les sets joués, en un seul calcul : {set: {'a': ..., 'b': ...}}."""
+    sets = feuille.sets_joues
+    if not sets:
+        return {}
+    equipes = np.stack([feuille.sets[n][cote].scores for n in sets for cote in (0, 1)])
+    adversaires = np.stack([feuille.sets[n][1 - cote].scores for n in sets for cote in (0, 1)])
+    stats = calculer_stats_rotations(equipes, adversaires)
+    return {n: {cote: {cle: valeurs[2 * i + k] for cle, valeurs in stats.items()} for k, cote in enumerate('ab')}
+            for i, n in enumerate(sets)}
+
+def passages_rotation(stats: dict, rotation: int) -> tuple:
+    """Listes des points marqués et encaissés à chaque passage dans une rotation (pour l'affichage)."""
+    joues = stats['joues'][:, rotation]
+    return stats['marques'][joues, rotation].tolist(), stats['encaisses'][joues, rotation].tolist()
+
+def format_stats(marques, encaisses):
+    """Prépare les chaînes de caractères pour l'affichage Matplotlib."""
+    max_l = max(len(marques), len(encaisses))
+    m = marques + [0] * (max_l - len(marques))
+    e = encaisses + [0] * (max_l - len(encaisses))
+    
+    txt_m = "\n".join([f"{k+1}  {int(v)}" for k, v in enumerate(m)])
+    txt_e = "\n".join([f"{k+1}  {int(v)}" for k, v in enumerate(e)])
+    txt_d = "\n".join([f"{int(mv-ev):+d}" for mv, ev in zip(m, e)])
+    
+    return txt_m, txt_e, txt_d, int(sum(m)), int(sum(e))
@@ -0,0 +1,177 @@
+"""
+Base de saison (SQLite) : chaque match analysé y est versé une fois (clé = SHA-256 du PDF), avec ses sets,
+les statistiques de rotation et les effectifs ; les requêtes de saison n'ont plus besoin de ré-extraire les PDF.
+"""
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from volleysheet.rotations import stats_rotations_match
+
+# `VOLLEY_SAISON` : chemin de la base (par défaut dans ~/.local/share/volleysheet)
+FICHIER_SAISON = os.environ.get('VOLLEY_SAISON', os.path.join(os.path.expanduser('~'), '.local', 'share',
+                                                               'volleysheet', 'saison.sqlite'))
+MATCHS_RECENTS = 20  # matchs pris en compte par défaut dans les requêtes de saison
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matchs (
+    sha256 TEXT PRIMARY KEY,
+    fichier TEXT,
+    date_match TEXT,
+    equipe_a TEXT NOT NULL,
+    equipe_b TEXT NOT NULL,
+    sets_a INTEGER,
+    sets_b INTEGER,
+    ingere_le REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sets (
+    sha256 TEXT NOT NULL REFERENCES matchs(sha256) ON DELETE CASCADE,
+    set_num INTEGER NOT NULL,
+    score_a INTEGER,
+    score_b INTEGER,
+    PRIMARY KEY (sha256, set_num)
+);
+CREATE TABLE IF NOT EXISTS rotations (
+    sha256 TEXT NOT NULL REFERENCES matchs(sha256) ON DELETE CASCADE,
+    set_num INTEGER NOT NULL,
+    equipe TEXT NOT NULL,
+    rotation INTEGER NOT NULL,
+    passages INTEGER NOT NULL,
+    marques INTEGER NOT NULL,
+    encaisses INTEGER NOT NULL,
+    PRIMARY KEY (sha256, set_num, equipe, rotation)
+);
+CREATE TABLE IF NOT EXISTS effectifs (
+    sha256 TEXT NOT NULL REFERENCES matchs(sha256) ON DELETE CASCADE,
+    categorie TEXT NOT NULL,
+    equipe TEXT,
+    code TEXT,
+    identite TEXT,
+    licence TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_matchs_equipe_a ON matchs(equipe_a, date_match);
+CREATE INDEX IF NOT EXISTS idx_matchs_equipe_b ON matchs(equipe_b, date_match);
+CREATE INDEX IF NOT EXISTS idx_matchs_date ON matchs(date_match);
+CREATE INDEX IF NOT EXISTS idx_rotations_equipe ON rotations(equipe, sha256);
+CREATE INDEX IF NOT EXISTS idx_effectifs_licence ON effectifs(licence);
+CREATE INDEX IF NOT EXISTS idx_effectifs_equipe ON effectifs(equipe);
+"""
+
+# ======================================================================
+# BASE - Ouverture et ingestion
+# ======================================================================
+
+def ouvrir_saison(chemin: str = FICHIER_SAISON) -> sqlite3.Connection:
+    """Ouvre (et crée au besoin) la base de saison ; WAL pour lire pendant qu'un lot écrit."""
+    if chemin != ':memory:':
+        os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    connexion = sqlite3.connect(chemin)
+    connexion.execute("PRAGMA journal_mode=WAL")
+    connexion.execute("PRAGMA foreign_keys=ON")
+    connexion.executescript(SCHEMA)
+    return connexion
+
+def hashes_ingeres(connexion: sqlite3.Connection) -> set:
+    """SHA-256 des PDF déjà versés dans la base."""
+    return {sha256 for (sha256,) in connexion.execute("SELECT sha256 FROM matchs")}
+
+def lignes_saison(match: dict, sha256: str, fichier: str = None) -> dict:
+    """
+    Lignes à insérer pour un match analysé (tuples simples, transmissibles entre processus) :
+    {'matchs', 'sets', 'rotations', 'effectifs'} ; None si la feuille n'a pas de tableau des scores.
+    """
+    feuille = match['feuille']
+    if feuille is None:
+        return None
+    equipe_a, equipe_b = feuille.equipes
+    sets_a, sets_b = feuille.sets_gagnes()
+    scores = feuille.scores_equipes
+
+    lignes = {
+        'matchs': [(sha256, fichier, match.get('date'), equipe_a, equipe_b, sets_a, sets_b, time.time())],
+        'sets': [(sha256, n, *(int(v) if v >= 0 else None for v in scores[n - 1]))
+                 for n in feuille.sets_joues],
+        'rotations': [],
+        'effectifs': [],
+    }
+    for n, stats_set in stats_rotations_match(feuille).items():
+        for cote, nom in zip('ab', feuille.equipes):
+            stats = stats_set[cote]
+            passages = stats['joues'].sum(axis=0)
+            lignes['rotations'].extend(
+                (sha256, n, nom, rotation, int(passages[rotation]), int(stats['total_marques'][rotation]),
+                 int(stats['total_encaisses'][rotation]))
+                for rotation in range(len(passages)))
+
+    # Effectifs : le côté (A/B) lu sur la feuille devient le nom de l'équipe
+    noms = {'A': equipe_a, 'B': equipe_b}
+    for categorie, df in (match.get('effectifs') or {}).items():
+        code = df.columns[0]
+        lignes['effectifs'].extend((sha256, categorie, noms.get(ligne['Equipe']), ligne[code], ligne['Identite'],
+                                    ligne['Licence']) for ligne in df.to_dict(orient='records'))
+    return lignes
+
+def ecrire_lignes(connexion: sqlite3.Connection, lignes: dict) -> bool:
+    """Verse les lignes d'un match en une transaction ; False (rien n'est écrit) si le match y est déjà."""
+    with connexion:
+        if connexion.execute("INSERT OR IGNORE INTO matchs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             lignes['matchs'][0]).rowcount == 0:
+            return False
+        connexion.executemany("INSERT INTO sets VALUES (?, ?, ?, ?)", lignes['sets'])
+        connexion.executemany("INSERT INTO rotations VALUES (?, ?, ?, ?, ?, ?, ?)", lignes['rotations'])
+        connexion.executemany("INSERT INTO effectifs VALUES (?, ?, ?, ?, ?, ?)", lignes['effectifs'])
+    return True
+
+def ingerer_match(connexion: sqlite3.Connection, match: dict, sha256: str, fichier: str = None) -> bool:
+    """Verse un match analysé dans la base ; False s'il y est déjà ou s'il n'a pas de tableau des scores."""
+    if connexion.execute("SELECT 1 FROM matchs WHERE sha256 = ?", (sha256,)).fetchone():
+        return False
+    lignes = lignes_saison(match, sha256, fichier)
+    return lignes is not None and ecrire_lignes(connexion, lignes)
+
+# ======================================================================
+# REQUÊTES DE SAISON
+# ======================================================================
+
+def equipes_saison(connexion: sqlite3.Connection) -> list:
+    """Noms des équipes présentes dans la base, par ordre alphabétique."""
+    return [nom for (nom,) in connexion.execute(
+        "SELECT equipe_a FROM matchs UNION SELECT equipe_b FROM matchs ORDER BY 1")]
+
+def matchs_equipe(connexion: sqlite3.Connection, equipe: str, derniers: int = MATCHS_RECENTS) -> pd.DataFrame:
+    """Derniers matchs d'une équipe (les plus récents d'abord)."""
+    return pd.read_sql_query(
+        """SELECT date_match, equipe_a, equipe_b, sets_a, sets_b, fichier FROM matchs
+           WHERE equipe_a = :equipe OR equipe_b = :equipe
+           ORDER BY date_match DESC, ingere_le DESC LIMIT :derniers""",
+        connexion, params={'equipe': equipe, 'derniers': derniers})
+
+def efficacite_rotations(connexion: sqlite3.Connection, equipe: str, derniers: int = MATCHS_RECENTS) -> pd.DataFrame:
+    """
+    Efficacité de chaque rotation d'une équipe sur ses `derniers` matchs : passages, points marqués, encaissés,
+    différentiel et part des points gagnés (%).
+    """
+    df = pd.read_sql_query(
+        """WITH recents AS (
+               SELECT sha256 FROM matchs WHERE equipe_a = :equipe OR equipe_b = :equipe
+               ORDER BY date_match DESC, ingere_le DESC LIMIT :derniers)
+           SELECT rotation, COUNT(DISTINCT sha256) AS matchs, SUM(passages) AS passages,
+                  SUM(marques) AS marques, SUM(encaisses) AS encaisses
+           FROM rotations WHERE equipe = :equipe AND sha256 IN recents
+           GROUP BY rotation ORDER BY rotation""",
+        connexion, params={'equipe': equipe, 'derniers': derniers})
+    df['differentiel'] = df['marques'] - df['encaisses']
+    joues = df['marques'] + df['encaisses']
+    df['pct_gagnes'] = np.where(joues > 0, df['marques'] / joues.where(joues > 0, 1) * 100, np.nan).round(1)
+    return df
+
+def matchs_joueur(connexion: sqlite3.Connection, licence: str) -> pd.DataFrame:
+    """Matchs d'un joueur (ou membre du staff) d'après sa licence."""
+    return pd.read_sql_query(
+        """SELECT m.date_match, e.equipe, e.categorie, e.code, e.identite, m.equipe_a, m.equipe_b, m.sets_a, m.sets_b
+           FROM effectifs e JOIN matchs m ON m.sha256 = e.sha256
+           WHERE e.licence = :licence ORDER BY m.date_match DESC""",
+        connexion, params={'licence': licence})
@@ -0,0 +1,226 @@
+"""
+Stockage disque des analyses, adressé par contenu : clé = SHA-256 du PDF + moteur + versions de mise en page,
+des gabarits et du format. Le dossier peut être partagé entre plusieurs répliques du serveur (volume commun) :
+les entrées sont des données JSON compressées, jamais du code exécuté à la lecture.
+"""
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from volleysheet.extraction import notifier_journal, version_gabarits
+from volleysheet.pipeline import analyser_feuille, construire_feuille, nouveau_match
+from volleysheet.structure import VERSION_MISE_EN_PAGE
+
+# `VOLLEY_STOCKAGE=""` désactive le stockage ; taille maximale en Mo via VOLLEY_STOCKAGE_MAX_MO
+DOSSIER_STOCKAGE = os.environ.get('VOLLEY_STOCKAGE', os.path.join(os.path.expanduser('~'), '.cache', 'volleysheet'))
+TAILLE_MAX_STOCKAGE = int(os.environ.get('VOLLEY_STOCKAGE_MAX_MO', '512')) * 1024 * 1024
+EXTENSION = '.match'
+FORMAT_STOCKAGE = 2  # à incrémenter à chaque changement du contenu des entrées (1 : pickle)
+
+def cle_stockage(sha256: str, moteur: str, version_mise_en_page: int, version_registre: str) -> str:
+    """Nom de l'entrée : change dès que le PDF, le moteur, la mise en page, les gabarits ou le format changent."""
+    return f"{sha256}-{moteur}-v{version_mise_en_page}-{version_registre}-f{FORMAT_STOCKAGE}"
+
+# ======================================================================
+# FORMAT DES ENTRÉES - Analyse en JSON : tableaux, effectifs et métadonnées, sans le modèle typé
+# ======================================================================
+
+def _tableau_vers_json(df: pd.DataFrame):
+    """Tableau en colonnes, types, index (absent si 0..n-1) et lignes ; les cellules vides deviennent null."""
+    if df is None:
+        return None
+    return {
+        'colonnes': df.columns.tolist(),
+        'types': [str(t) for t in df.dtypes],
+        'index': None if df.index.equals(pd.RangeIndex(len(df))) else df.index.tolist(),
+        'lignes': df.astype(object).where(df.notna(), None).to_numpy().tolist(),
+    }
+
+def _tableau_depuis_json(donnees: dict):
+    if donnees is None:
+        return None
+    df = pd.DataFrame(donnees['lignes'], columns=donnees['colonnes'], index=donnees['index'], dtype=object)
+    for position, type_colonne in enumerate(donnees['types']):
+        df.isetitem(position, df.iloc[:, position].astype(type_colonne))
+    return df
+
+def _valeur_json(valeur):
+    """Scalaires numpy laissés dans les cellules ou les durées."""
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    raise TypeError(f"Valeur non stockable : {type(valeur).__name__}")
+
+def _match_vers_json(match: dict) -> bytes:
+    """Analyse sérialisée en JSON compressé ; le modèle typé n'est pas stocké, il est reconstruit à la lecture."""
+    zones = {nom: [_tableau_vers_json(t) for t in zone] if isinstance(zone, list) else _tableau_vers_json(zone)
+             for nom, zone in match['zones'].items()}
+    sets = {str(n): {'a': _tableau_vers_json(s['a']), 'b': _tableau_vers_json(s['b']),
+                     'temps_morts': s['temps_morts']} for n, s in match['sets'].items()}
+    effectifs = match['effectifs']
+    document = {
+        'format': FORMAT_STOCKAGE,
+        'gabarit': match['gabarit'],
+        'zones': zones,
+        'equipes': match['equipes'],
+        'date': match['date'],
+        'scores': _tableau_vers_json(match['scores']),
+        'sets': sets,
+        'effectifs': None if effectifs is None else {c: _tableau_vers_json(t) for c, t in effectifs.items()},
+        'durees': match['durees'],
+    }
+    return zlib.compress(json.dumps(document, ensure_ascii=False, default=_valeur_json).encode('utf-8'))
+
+def _match_depuis_json(donnees: bytes) -> dict:
+    """Inverse de _match_vers_json ; ValueError si l'entrée n'est pas une analyse de ce format."""
+    document = json.loads(zlib.decompress(donnees).decode('utf-8'))
+    if not isinstance(document, dict) or document.get('format') != FORMAT_STOCKAGE:
+        raise ValueError("Entrée de stockage d'un autre format")
+
+    match = nouveau_match()
+    match['gabarit'] = document['gabarit']
+    match['zones'] = {nom: [_tableau_depuis_json(t) for t in zone] if isinstance(zone, list)
+                      else _tableau_depuis_json(zone) for nom, zone in document['zones'].items()}
+    match['equipes'] = None if document['equipes'] is None else tuple(document['equipes'])
+    match['date'] = document['date']
+    match['scores'] = _tableau_depuis_json(document['scores'])
+    match['sets'] = {int(n): {'a': _tableau_depuis_json(s['a']), 'b': _tableau_depuis_json(s['b']),
+                              'temps_morts': {cote: tuple(t) for cote, t in s['temps_morts'].items()}}
+                     for n, s in document['sets'].items()}
+    if document['effectifs'] is not None:
+        match['effectifs'] = {c: _tableau_depuis_json(t) for c, t in document['effectifs'].items()}
+    match['durees'] = document['durees']
+    match['feuille'] = construire_feuille(match)
+    return match
+
+def lire_match(dossier: str, cle: str):
+    """Renvoie l'analyse stockée (None si absente ou illisible) et la marque comme récemment utilisée."""
+    chemin = os.path.join(dossier, cle + EXTENSION)
+    try:
+        with open(chemin, 'rb') as f:
+            match = _match_depuis_json(f.read())
+        os.utime(chemin)
+        return match
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Entrée corrompue ou d'un autre format : on la retire, elle sera recalculée
+        try:
+            os.remove(chemin)
+        except OSError:
+            pass
+        return None
+
+def ecrire_match(dossier: str, cle: str, match: dict, taille_max: int = TAILLE_MAX_STOCKAGE):
+    """
+    Écrit l'analyse compressée dans un fichier temporaire du même dossier puis le renomme (atomique) :
+    un lecteur ne voit jamais d'entrée partielle, et deux écrivains concurrents écrivent le même contenu.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    donnees = _match_vers_json(match)
+    descripteur, temporaire = tempfile.mkstemp(dir=dossier, suffix='.tmp')
+    try:
+        with os.fdopen(descripteur, 'wb') as f:
+            f.write(donnees)
+        os.replace(temporaire, os.path.join(dossier, cle + EXTENSION))
+    except BaseException:
+        os.remove(temporaire)
+        raise
+    evincer(dossier, taille_max)
+
+def evincer(dossier: str, taille_max: int = TAILLE_MAX_STOCKAGE):
+    """Supprime les entrées les moins récemment utilisées jusqu'à repasser sous la taille maximale."""
+    entrees = []
+    for entree in os.scandir(dossier):
+        if entree.name.endswith(EXTENSION):
+            try:
+                infos = entree.stat()
+            except FileNotFoundError:
+                continue
+            entrees.append((infos.st_mtime, infos.st_size, entree.path))
+
+    total = sum(taille for _, taille, _ in entrees)
+    for _, taille, chemin in sorted(entrees):
+        if total <= taille_max:
+            break
+        try:
+            os.remove(chemin)
+        except FileNotFoundError:
+            pass  # déjà évincée par une autre réplique
+        total -= taille
+
+def analyser_avec_stockage(pdf_bytes: bytes, sha256: str, moteur: str, gabarits: dict, dossier: str = DOSSIER_STOCKAGE,
+                           notifier=notifier_journal, progression=None, match: dict = None) -> dict:
+    """
+    Sert l'analyse depuis le stockage si ce PDF y est déjà, sinon l'extrait puis l'y dépose.
+    `match` est rempli au fil de l'extraction (voir analyser_feuille), pas quand l'analyse vient du stockage.
+    """
+    if not dossier:
+        return analyser_feuille(pdf_bytes, moteur, gabarits, notifier, progression, match)
+
+    cle = cle_stockage(sha256, moteur, VERSION_MISE_EN_PAGE, version_gabarits(gabarits or {}))
+    stocke = lire_match(dossier, cle)
+    if stocke is not None:
+        notifier('info', "♻️ Analyse déjà connue : extraction évitée.")
+        return stocke
+
+    match = analyser_feuille(pdf_bytes, moteur, gabarits, notifier, progression, match)
+    try:
+        ecrire_match(dossier, cle, match)
+    except OSError as e:
+        notifier('erreur', f"❌ Impossible d'écrire dans le stockage des analyses : {e}")
+    return match
+
+# ======================================================================
+# ANALYSES EN ARRIÈRE-PLAN - Lancées dès le dépôt du fichier, suivies par la page
+# ======================================================================
+
+# `VOLLEY_ANALYSES_SIMULTANEES` : feuilles analysées en même temps par le serveur (toutes sessions confondues)
+ANALYSES_SIMULTANEES = int(os.environ.get('VOLLEY_ANALYSES_SIMULTANEES', '4'))
+SUIVIS_CONSERVES = 32  # analyses terminées gardées en mémoire pour les sessions qui les affichent
+
+_SUIVIS = OrderedDict()  # clé de stockage -> suivi, du moins au plus récemment demandé
+_VERROU_SUIVIS = threading.Lock()
+_executeur_analyses = None  # créé à la première analyse lancée : la ligne de commande n'en a pas besoin
+
+def _executeur() -> ThreadPoolExecutor:
+    """Exécuteur partagé des analyses en arrière-plan ; à appeler sous _VERROU_SUIVIS."""
+    global _executeur_analyses
+    if _executeur_analyses is None:
+        _executeur_analyses = ThreadPoolExecutor(max_workers=ANALYSES_SIMULTANEES, thread_name_prefix='analyse')
+    return _executeur_analyses
+
+def lancer_analyse(pdf_bytes: bytes, sha256: str, moteur: str, gabarits: dict,
+                   dossier: str = DOSSIER_STOCKAGE) -> dict:
+    """
+    Lance l'analyse en arrière-plan (une seule par clé de stockage, partagée entre sessions) et renvoie son suivi :
+    'match' (rempli au fil des étapes), 'etapes' (terminées, dans l'ordre), 'messages' [(niveau, message)]
+    et 'resultat' (Future de l'analyse complète). Une analyse en échec est relancée à la demande suivante.
+    """
+    cle = cle_stockage(sha256, moteur, VERSION_MISE_EN_PAGE, version_gabarits(gabarits or {}))
+    with _VERROU_SUIVIS:
+        suivi = _SUIVIS.get(cle)
+        if suivi is not None and not (suivi['resultat'].done() and suivi['resultat'].exception() is not None):
+            _SUIVIS.move_to_end(cle)
+            return suivi
+
+        suivi = {'match': nouveau_match(), 'etapes': [], 'messages': []}
+        suivi['resultat'] = _executeur().submit(
+            analyser_avec_stockage, pdf_bytes, sha256, moteur, gabarits, dossier,
+            notifier=lambda niveau, message: suivi['messages'].append((niveau, message)),
+            progression=lambda etape, faites, total: suivi['etapes'].append(etape),
+            match=suivi['match'])
+        _SUIVIS[cle] = suivi
+        _SUIVIS.move_to_end(cle)
+
+        # Au-delà de la limite, les analyses terminées les plus anciennes sont oubliées (jamais celles en cours)
+        terminees = [c for c, s in _SUIVIS.items() if s['resultat'].done()]
+        for ancienne in terminees[:max(0, len(_SUIVIS) - SUIVIS_CONSERVES)]:
+            del _SUIVIS[ancienne]
+    return suivi
@@ -0,0 +1,307 @@
+"""Structuration de la feuille : mise en page déclarative, modèle typé, temps morts, scores et noms d'équipes."""
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from volleysheet.extraction import notifier_journal
+
+TARGET_ROWS = 12
+TARGET_COLS = 6
+
+# Version de la mise en page (zones + structuration) : à incrémenter dès qu'elle change,
+# pour invalider les analyses déjà en cache
+VERSION_MISE_EN_PAGE = 3  # 2 : chronologie des sets dans MatchSheet ; 3 : date du match
+
+# ======================================================================
+# MISE EN PAGE DÉCLARATIVE - Transferts grille brute -> tableau cible (12 x 6)
+# ======================================================================
+
+def _cols(debut: int, pas: int = 1) -> list:
+    """Six indices de colonnes source : debut, debut + pas, ..."""
+    return list(range(debut, debut + TARGET_COLS * pas, pas))
+
+# Pour chaque zone : (ligne source, colonnes source, ligne cible).
+# Lignes cibles : R0 Formation, R1 Remplaçants, R2 Score, R3 Action L1, R4-R7 Libero/Rotations, R8-R11 Actions.
+# Un transfert n'est appliqué que si la ligne et toutes ses colonnes existent dans la grille brute.
+_MISE_EN_PAGE_EQUIPE_GAUCHE = [
+    (2, _cols(1), 0), (3, _cols(2), 1), (4, _cols(2), 2), (5, _cols(3), 3),
+    (6, _cols(3, 2), 4), (7, _cols(2, 2), 5), (8, _cols(2, 2), 6), (9, _cols(2, 2), 7),
+    (6, _cols(4, 2), 8), (7, _cols(3, 2), 9), (8, _cols(3, 2), 10), (9, _cols(3, 2), 11),
+]
+_MISE_EN_PAGE_EQUIPE_DROITE = [
+    (2, _cols(1), 0), (3, _cols(1), 1), (4, _cols(1), 2), (5, _cols(1), 3),
+    (6, _cols(1, 2), 4), (7, _cols(2, 2), 5), (8, _cols(2, 2), 6), (9, _cols(2, 2), 7),
+    (6, _cols(2, 2), 8), (7, _cols(3, 2), 9), (8, _cols(3, 2), 10), (9, _cols(3, 2), 11),
+]
+_MISE_EN_PAGE_EQUIPE_DROITE_L9 = [
+    (2, _cols(1), 0), (3, _cols(1), 1), (4, _cols(1), 2), (5, _cols(1), 3),
+    (6, _cols(1, 2), 4), (7, _cols(2, 2), 5), (8, _cols(2, 2), 6), (9, _cols(1, 2), 7),
+    (6, _cols(2, 2), 8), (7, _cols(3, 2), 9), (8, _cols(3, 2), 10), (9, _cols(2, 2), 11),
+]
+
+MISE_EN_PAGE_ZONES = {
+    'set_1_a': _MISE_EN_PAGE_EQUIPE_GAUCHE,
+    'set_1_b': _MISE_EN_PAGE_EQUIPE_DROITE,
+    'set_2_b': [(r, _cols(0), r - 2) for r in range(2, 6)]
+               + [(r, _cols(0, 2), r - 2) for r in range(6, 10)]
+               + [(r, _cols(1, 2), r + 2) for r in range(6, 10)],
+    'set_2_a': [(r, _cols(1), r - 2) for r in range(2, 6)]
+               + [(r, _cols(1, 2), r - 2) for r in range(6, 10)]
+               + [(r, _cols(2, 2), r + 2) for r in range(6, 10)],
+    'set_3_a': _MISE_EN_PAGE_EQUIPE_GAUCHE,
+    'set_3_b': _MISE_EN_PAGE_EQUIPE_DROITE_L9,
+    'set_4_b': _MISE_EN_PAGE_EQUIPE_DROITE_L9,
+    'set_4_a': [(r, _cols(1), r - 2) for r in range(2, 6)]
+               + [(r, _cols(1, 2), r - 2) for r in range(6, 10)]
+               + [(r, _cols(2, 2), r + 2) for r in range(6, 10)],
+    'set_5_b': [(r, _cols(1), r - 1) for r in range(1, 5)]
+               + [(5, _cols(1, 2), 4)] + [(r, _cols(2, 2), r - 1) for r in range(6, 9)]
+               + [(5, _cols(2, 2), 8)] + [(r, _cols(3, 2), r + 3) for r in range(6, 9)],
+    'set_5_a': [(r, _cols(0), r - 1) for r in range(1, 5)]
+               + [(r, _cols(0, 2), r - 1) for r in range(5, 9)]
+               + [(r, _cols(1, 2), r + 3) for r in range(5, 9)],
+}
+
+def _compiler_mise_en_page(transferts: list) -> tuple:
+    """Convertit une liste de transferts en tableaux d'indices NumPy (lignes (k,1), colonnes (k,6), cibles (k,))."""
+    lignes = np.array([[ligne] for ligne, _, _ in transferts], dtype=np.intp)
+    colonnes = np.array([cols for _, cols, _ in transferts], dtype=np.intp)
+    cibles = np.array([cible for _, _, cible in transferts], dtype=np.intp)
+    return lignes, colonnes, cibles
+
+MISE_EN_PAGE_COMPILEE = {zone: _compiler_mise_en_page(t) for zone, t in MISE_EN_PAGE_ZONES.items()}
+
+# ======================================================================
+# MOTEUR DE STRUCTURATION (un seul moteur pour tous les sets)
+# ======================================================================
+
+def structurer_zone(raw_df: pd.DataFrame, zone: str) -> pd.DataFrame:
+    """Crée le tableau cible (12 x 6) d'une zone en rassemblant toutes ses cellules en une indexation NumPy."""
+    lignes, colonnes, cibles = MISE_EN_PAGE_COMPILEE[zone]
+    cible = np.full((TARGET_ROWS, TARGET_COLS), '', dtype=object)
+
+    if raw_df is not None:
+        brut = raw_df.to_numpy(dtype=object)
+        valides = (lignes[:, 0] < brut.shape[0]) & (colonnes.max(axis=1) < brut.shape[1])
+        cible[cibles[valides]] = brut[lignes[valides], colonnes[valides]]
+
+    return pd.DataFrame(cible, columns=[f'C{i}' for i in range(TARGET_COLS)])
+
+# ======================================================================
+# MODÈLE TYPÉ - MatchSheet (entiers compacts au lieu de chaînes)
+# ======================================================================
+
+# Sentinelles des cases non numériques
+VIDE = -1     # case vide (ou illisible)
+CASE_X = -2   # case barrée 'X'
+
+def _entier_cellule(valeur) -> int:
+    """Convertit une case ('12', '12.0', 'X', '', None...) en entier ; VIDE / CASE_X sinon."""
+    texte = str(valeur).upper().strip()
+    if texte == 'X':
+        return CASE_X
+    try:
+        return int(float(texte))
+    except (ValueError, OverflowError):
+        return VIDE
+
+def libelle_cellule(valeur: int) -> str:
+    """Texte d'affichage d'une case entière ('' pour VIDE, 'X' pour CASE_X)."""
+    return '' if valeur == VIDE else ('X' if valeur == CASE_X else str(valeur))
+
+def grille_entiers(valeurs) -> np.ndarray:
+    """Convertit une seule fois un tableau de cases texte en grille int16."""
+    return np.array([[_entier_cellule(v) for v in ligne] for ligne in valeurs], dtype=np.int16)
+
+@dataclass(frozen=True, slots=True)
+class TeamSet:
+    """Une équipe sur un set : le tableau cible 12 x 6 converti en entiers."""
+    formation: np.ndarray      # (6,)   R0 : numéros des joueurs en I..VI
+    remplacements: np.ndarray  # (3, 6) R1-R3 : remplaçants, score et action au remplacement
+    scores: np.ndarray         # (8, 6) R4-R11 : score cumulé à la fin de chaque service
+    temps_morts: tuple = (None, None)
+
+    @classmethod
+    def depuis_tableau(cls, df: pd.DataFrame, temps_morts: tuple = (None, None)) -> 'TeamSet':
+        grille = grille_entiers(df.to_numpy(dtype=object))
+        return cls(grille[0], grille[1:4], grille[4:TARGET_ROWS], temps_morts)
+
+    @property
+    def points(self) -> np.ndarray:
+        """Scores cumulés où VIDE et CASE_X valent 0."""
+        return np.where(self.scores >= 0, self.scores, 0)
+
+    def numeros(self) -> list:
+        """Numéros de la formation en texte."""
+        return [libelle_cellule(n) for n in self.formation]
+
+@dataclass(frozen=True, slots=True)
+class MatchSheet:
+    """Feuille de match complète, construite une fois après l'extraction ; base de toutes les analyses."""
+    equipes: tuple            # (nom équipe A, nom équipe B)
+    scores_sets: np.ndarray   # (5, 2) : colonnes Gauche (C0) / Droite (C1) du récapitulatif, VIDE si absent
+    sets: dict                # {numéro de set: (TeamSet équipe a, TeamSet équipe b)}
+    chronologies: dict = field(default_factory=dict)  # {numéro de set: chronologie point par point}
+
+    @property
+    def sets_joues(self) -> list:
+        """Numéros des sets dont le récapitulatif contient un score."""
+        return [int(i) + 1 for i in np.flatnonzero(self.scores_sets[:, 0] != VIDE)]
+
+    def sets_voisins(self, set_num: int) -> list:
+        """Sets joués qui encadrent `set_num`, le suivant d'abord : ceux à préparer pendant qu'il s'affiche."""
+        joues = self.sets_joues
+        idx = joues.index(set_num)
+        return joues[idx + 1:idx + 2] + joues[max(idx - 1, 0):idx]
+
+    @property
+    def scores_equipes(self) -> np.ndarray:
+        """
+        Scores des sets (5, 2) par équipe : colonne 0 = équipe A, colonne 1 = équipe B. Au récapitulatif, la
+        colonne Gauche (C0) est l'équipe A aux sets 1, 3 et 5, et l'équipe B aux sets 2 et 4 (changement de côté).
+        """
+        scores = self.scores_sets.copy()
+        scores[1::2] = scores[1::2, ::-1]
+        return scores
+
+    def sets_gagnes(self) -> tuple:
+        """Nombre de sets gagnés (équipe A, équipe B)."""
+        points = np.where(self.scores_equipes >= 0, self.scores_equipes, 0)
+        return int((points[:, 0] > points[:, 1]).sum()), int((points[:, 1] > points[:, 0]).sum())
+
+# ======================================================================
+# FONCTION TEMPS MORT (SET 1 À 5) - Lecture dans les grilles déjà extraites
+# ======================================================================
+
+# Par set : (zone brute, cases équipe a, cases équipe b, cases de secours équipe a) en (ligne, colonne)
+CASES_TEMPS_MORTS = {
+    1: ('set_1_b', [(8, 1), (9, 1)], [(8, 14), (9, 14)], []),
+    2: ('set_2_a', [(8, 13), (9, 13)], [(8, 0), (9, 0)], []),
+    3: ('set_3_b', [(8, 1), (9, 0)], [(8, 14), (9, 13)], []),
+    4: ('set_4_a', [(8, 13), (9, 13)], [(8, 0), (9, 0)], []),
+    5: ('set_5_b', [(7, 1), (8, 1)], [(7, 14), (8, 14)], [(16, 12), (17, 12)]),
+}
+
+def _case_brute(grille: pd.DataFrame, ligne: int, col: int):
+    """Texte d'une case de la grille brute, None si elle n'existe pas."""
+    if grille is None or ligne >= grille.shape[0] or col >= grille.shape[1]:
+        return None
+    return str(grille.iloc[ligne, col]).strip()
+
+def extraire_temps_morts(raw_zones: dict, set_num: int) -> dict:
+    """
+    Lit les deux temps morts de chaque équipe d'un set dans les grilles brutes (aucune relecture du PDF).
+    Au Set 5, les cases de secours (R16, R17) remplacent celles de l'équipe a si elles sont vides.
+    Retourne {'a': (T1, T2), 'b': (T1, T2)}.
+    """
+    zone, cases_a, cases_b, secours_a = CASES_TEMPS_MORTS[set_num]
+    grille = raw_zones.get(zone)
+    if grille is not None and grille.empty:
+        grille = None
+
+    temps_a = [_case_brute(grille, *case) for case in cases_a]
+    for i, case in enumerate(secours_a):
+        if not temps_a[i] or temps_a[i].lower() == 'none':
+            temps_a[i] = _case_brute(grille, *case)
+
+    return {'a': tuple(temps_a), 'b': tuple(_case_brute(grille, *case) for case in cases_b)}
+
+# ======================================================================
+# FONCTION Structure - Organisation des scores par set
+# ======================================================================
+
+def process_and_structure_scores(raw_df_data: pd.DataFrame, notifier=notifier_journal) -> pd.DataFrame:
+    """
+    Crée un DataFrame cible de 5 lignes et 2 colonnes (R5 x C2) pour les scores.
+    Gère les conditions de vérification sur C2, C5 et C6.
+    """
+    # Initialisation des variables locales
+    resultats = {
+        'a': [None]*5, # Scores équipe A (indices 0 à 4)
+        'b': [None]*5  # Scores équipe B (indices 0 à 4)
+    }
+
+    # Définition des lignes cibles (Index 0-basé)
+    ROWS = {1: 28, 2: 29, 3: 30, 4: 31, 5: 32}
+
+    # Configuration des colonnes
+    COL_SCORE_GAUCHE = 3
+    COL_VERIF_GAUCHE = 2
+    COL_SCORE_DROITE_SET_1 = 5
+    COL_VERIF_DROITE_SET_1 = 6
+    COL_SCORE_DROITE_SET_2_5 = 4
+    COL_VERIF_DROITE_SET_2_5 = 5
+
+    # --- A. AFFECTATION ÉQUIPE GAUCHE (COLONNE C3) ---
+    for set_num, target_row in ROWS.items():
+        if raw_df_data is not None and len(raw_df_data) > target_row:
+            score_val = str(raw_df_data.iloc[target_row, COL_SCORE_GAUCHE]).strip()
+            verif_val = str(raw_df_data.iloc[target_row, COL_VERIF_GAUCHE]).strip()
+
+            if verif_val in ['0', '1']:
+                # Logique alternée A/B selon le set
+                if set_num in [1, 3, 5]: resultats['a'][set_num-1] = score_val
+                else: resultats['b'][set_num-1] = score_val
+
+    # --- B. AFFECTATION ÉQUIPE DROITE ---
+    # Set 1 Droite
+    r1 = ROWS[1]
+    if raw_df_data is not None and len(raw_df_data) > r1 and len(raw_df_data.columns) > COL_VERIF_DROITE_SET_1:
+        if str(raw_df_data.iloc[r1, COL_VERIF_DROITE_SET_1]).strip() in ['0', '1']:
+            resultats['b'][0] = str(raw_df_data.iloc[r1, COL_SCORE_DROITE_SET_1]).strip()
+
+    # Sets 2, 3, 4, 5 Droite
+    for set_num in [2, 3, 4, 5]:
+        target_row = ROWS[set_num]
+        if raw_df_data is not None and len(raw_df_data) > target_row and len(raw_df_data.columns) > COL_VERIF_DROITE_SET_2_5:
+            score_val = str(raw_df_data.iloc[target_row, COL_SCORE_DROITE_SET_2_5]).strip()
+            verif_val = str(raw_df_data.iloc[target_row, COL_VERIF_DROITE_SET_2_5]).strip()
+
+            if verif_val in ['0', '1']:
+                if set_num in [2, 4]: resultats['a'][set_num-1] = score_val
+                else: resultats['b'][set_num-1] = score_val
+
+    # --- 2. CRÉATION DU DATAFRAME FINAL ---
+    df_structured = pd.DataFrame({
+        'Scores Gauche (C0)': [resultats['a'][0], resultats['b'][1], resultats['a'][2], resultats['b'][3], resultats['a'][4]],
+        'Scores Droite (C1)': [resultats['b'][0], resultats['a'][1], resultats['b'][2], resultats['a'][3], resultats['b'][4]]
+    }, index=[f'Set {i}' for i in range(1, 6)])
+
+    notifier('succes', "✅ Scores structurés avec succès.")
+    return df_structured
+
+# ======================================================================
+# NOMS DES ÉQUIPES - Structure de l'en-tête déjà extrait
+# ======================================================================
+
+def process_and_structure_noms_equipes(raw_zones: dict):
+    """Récupère et nettoie les noms des équipes A et B depuis l'en-tête déjà extrait."""
+    tables = raw_zones.get('en_tete')
+    equipe_a, equipe_b = "Équipe A", "Équipe B"
+
+    if tables and len(tables) > 0:
+        df = tables[0]
+        try:
+            # Récupération et nettoyage (enlève les 2 premiers caractères et "Début")
+            raw_a = str(df.iloc[4, 1]).replace('\r', ' ').replace('\n', ' ').strip()
+            raw_b = str(df.iloc[4, 2]).replace('\r', ' ').replace('\n', ' ').strip()
+
+            equipe_a = raw_a[2:].split("Début")[0].strip()
+            equipe_b = raw_b[2:].split("Début")[0].strip()
+        except:
+            pass
+    return (equipe_a or "Équipe A"), (equipe_b or "Équipe B")
+
+MOTIF_DATE = re.compile(r'\b(\d{2})/(\d{2})/(\d{4})\b')
+
+def extraire_date_match(raw_zones: dict):
+    """Date du match (AAAA-MM-JJ) : première date jj/mm/aaaa trouvée dans les tableaux de l'en-tête, sinon None."""
+    for df in raw_zones.get('en_tete') or []:
+        for valeur in df.to_numpy().ravel():
+            trouvee = MOTIF_DATE.search(str(valeur))
+            if trouvee:
+                jour, mois, annee = trouvee.groups()
+                return f"{annee}-{mois}-{jour}"
+    return None
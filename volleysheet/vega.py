@@ -0,0 +1,195 @@
+"""
+Graphiques en spécifications Vega-Lite (dictionnaires JSON, rendus par le navigateur) : duel chronologique d'un set
+et terrains des rotations. Aucune dépendance graphique côté serveur ; la mise en page du duel est partagée
+avec le rendu matplotlib.
+"""
+import numpy as np
+
+from volleysheet.chronologie import construire_chronologie
+from volleysheet.rotations import format_stats, obtenir_rotation_positions, passages_rotation, stats_rotations
+from volleysheet.structure import CASE_X, VIDE, TeamSet, libelle_cellule
+
+# Rendus disponibles pour la page d'analyse (le premier est celui par défaut)
+RENDUS = ['vega', 'matplotlib']
+
+COULEUR_G, COULEUR_D = '#3498db', '#e67e22'
+COULEUR_A, COULEUR_B = 'royalblue', 'darkorange'
+
+# ======================================================================
+# DUEL CHRONOLOGIQUE - Mise en page commune aux deux rendus
+# ======================================================================
+
+def donnees_duel(equipe_g: TeamSet, equipe_d: TeamSet, chronologie: np.ndarray = None) -> dict:
+    """
+    Mise en page du duel en un passage vectorisé : une position horizontale par case de service affichée
+    (les 'X' et les lignes vides sont sautés), dans l'ordre de jeu.
+    Retourne 'libelles' et 'equipes' (0 = gauche, 1 = droite) par position, les barres ('x', 'bas', 'hauteur',
+    'equipe') et les séquences ('debut', 'fin', 'nom') ; positions et séquences sont des tableaux NumPy.
+    """
+    if chronologie is None:
+        chronologie = construire_chronologie(equipe_g, equipe_d)
+    scores = np.stack([equipe_g.scores, equipe_d.scores])            # (2, 8, 6)
+    formations = np.stack([equipe_g.formation, equipe_d.formation])  # (2, 6)
+    ordre = np.array([0, 1] if equipe_g.scores[0, 0] == CASE_X else [1, 0])
+
+    # Cases dans l'ordre de jeu : ligne, colonne, puis l'équipe qui reçoit en premier (même numérotation des tours)
+    lignes, colonnes, rangs = np.indices(scores.shape[1:] + (2,)).reshape(3, -1)
+    equipes = ordre[rangs]
+    ligne_active = ~(scores == VIDE).all(axis=(0, 2))
+    affichees = ligne_active[lignes] & (scores[equipes, lignes, colonnes] != CASE_X)
+    lignes, colonnes, equipes = lignes[affichees], colonnes[affichees], equipes[affichees]
+    tours = (lignes * 12 + colonnes * 2 + rangs[affichees])
+
+    # Barres : premier point de chaque tour dans la chronologie (score avant le tour) et nombre de points
+    tours_points, premiers, nombres = np.unique(chronologie['tour'], return_index=True, return_counts=True)
+    debut = chronologie[premiers]
+    bas = np.where(debut['marqueur'] == 0, debut['score_a'], debut['score_b']).astype(np.int64) - 1
+    x_barres = np.flatnonzero(np.isin(tours, tours_points))
+    i_points = np.searchsorted(tours_points, tours[x_barres])
+
+    # Séquences : une par ligne de la feuille qui a au moins une case affichée
+    _, debuts = np.unique(lignes, return_index=True)
+    fins = np.append(debuts[1:], lignes.size) - 1
+    noms = [f"{k}{'ère' if k == 1 else 'ème'} séquence" for k in range(1, debuts.size + 1)]
+
+    return {
+        'libelles': [libelle_cellule(v) for v in formations[equipes, colonnes]],
+        'equipes': equipes,
+        'barres': {'x': x_barres, 'bas': bas[i_points], 'hauteur': nombres[i_points], 'equipe': equipes[x_barres]},
+        'sequences': {'debut': debuts, 'fin': fins, 'nom': noms},
+    }
+
+def spec_duel_equipes(equipe_g: TeamSet, equipe_d: TeamSet, titre="Duel", nom_g="Équipe A", nom_d="Équipe B",
+                      chronologie: np.ndarray = None) -> dict:
+    """Spécification Vega-Lite du duel chronologique (barres de points par tour de service) ; None sans équipes."""
+    if equipe_g is None or equipe_d is None:
+        return None
+    duel = donnees_duel(equipe_g, equipe_d, chronologie)
+    noms = [nom_g, nom_d]
+    barres = duel['barres']
+    sequences = duel['sequences']
+    n = len(duel['libelles'])
+
+    valeurs_barres = [{'x0': x - 0.2, 'x1': x + 0.2, 'bas': b, 'haut': b + h, 'equipe': noms[e]}
+                      for x, b, h, e in zip(barres['x'].tolist(), barres['bas'].tolist(), barres['hauteur'].tolist(),
+                                            barres['equipe'].tolist())]
+    valeurs_sequences = [{'milieu': (d + f) / 2, 'separation': f + 0.5, 'nom': nom}
+                         for d, f, nom in zip(sequences['debut'].tolist(), sequences['fin'].tolist(), sequences['nom'])]
+    # Numéro du joueur au service sous chaque position, à la couleur de son équipe (axe horizontal masqué)
+    valeurs_joueurs = [{'x': x, 'libelle': libelle, 'couleur': (COULEUR_G, COULEUR_D)[e]}
+                       for x, (libelle, e) in enumerate(zip(duel['libelles'], duel['equipes'].tolist()))]
+    echelle_x = {'domain': [-0.5, n - 0.5]}
+    return {
+        '$schema': 'https://vega.github.io/schema/vega-lite/v5.json',
+        'title': titre,
+        'width': max(300, 22 * n), 'height': 360,
+        'layer': [
+            {'data': {'values': valeurs_barres}, 'mark': {'type': 'rect', 'stroke': 'black'},
+             'encoding': {'x': {'field': 'x0', 'type': 'quantitative', 'scale': echelle_x, 'axis': None},
+                          'x2': {'field': 'x1'},
+                          'y': {'field': 'bas', 'type': 'quantitative', 'scale': {'domain': [0, 35]},
+                                'axis': {'title': None, 'tickMinStep': 1}},
+                          'y2': {'field': 'haut'},
+                          'color': {'field': 'equipe', 'type': 'nominal',
+                                    'scale': {'domain': noms, 'range': [COULEUR_G, COULEUR_D]},
+                                    'legend': {'title': None, 'orient': 'top-left', 'symbolType': 'square'}}}},
+            {'data': {'values': valeurs_joueurs}, 'mark': {'type': 'text', 'fontWeight': 'bold', 'baseline': 'top', 'dy': 6},
+             'encoding': {'x': {'field': 'x', 'type': 'quantitative'}, 'y': {'datum': 0},
+                          'text': {'field': 'libelle'}, 'color': {'field': 'couleur', 'type': 'nominal', 'scale': None}}},
+            {'data': {'values': valeurs_sequences}, 'mark': {'type': 'rule', 'opacity': 0.15},
+             'encoding': {'x': {'field': 'separation', 'type': 'quantitative'}}},
+            {'data': {'values': valeurs_sequences},
+             'mark': {'type': 'text', 'fontWeight': 'bold', 'color': '#555555', 'dy': -8},
+             'encoding': {'x': {'field': 'milieu', 'type': 'quantitative'}, 'y': {'datum': 35},
+                          'text': {'field': 'nom'}}},
+        ],
+    }
+
+# ======================================================================
+# ROTATIONS - Terrains et points par passage (6 rotations x 2 services)
+# ======================================================================
+
+COORDS_A = {'IV': (7.5, 7.5), 'III': (7.5, 4.5), 'II': (7.5, 1.5), 'V': (3.0, 7.5), 'VI': (3.0, 4.5), 'I': (3.0, 1.5)}
+COORDS_B = {'II': (10.5, 7.5), 'III': (10.5, 4.5), 'IV': (10.5, 1.5), 'I': (15.0, 7.5), 'VI': (15.0, 4.5), 'V': (15.0, 1.5)}
+ROMAINS = ['I', 'II', 'III', 'IV', 'V', 'VI']
+
+def _textes_terrain(pos_a: dict, pos_b: dict, serveur: str) -> list:
+    """Numéros des joueurs sur le terrain ; le serveur est dessiné hors du terrain, derrière sa ligne de fond."""
+    textes = []
+    for pos, coords, couleur, equipe in ((pos_a, COORDS_A, COULEUR_A, 'A'), (pos_b, COORDS_B, COULEUR_B, 'B')):
+        for poste, numero in pos.items():
+            x, y = coords[poste]
+            if poste == 'I' and serveur == equipe:
+                x, y = (-1.5, 1.5) if equipe == 'A' else (19.5, 7.5)
+            textes.append({'x': x, 'y': y, 'texte': str(numero), 'couleur': couleur})
+    return textes
+
+def spec_rotations(equipe_a: TeamSet, equipe_b: TeamSet, nom_g: str, nom_d: str) -> dict:
+    """
+    Spécification Vega-Lite des 6 rotations : pour chacune, le terrain avec l'équipe A puis l'équipe B au service,
+    et sous chaque terrain les points marqués / encaissés à chaque passage (même contenu que figure_rotations).
+    """
+    base_a, base_b = equipe_a.numeros(), equipe_b.numeros()
+    stats_a = stats_rotations(equipe_a, equipe_b)
+    textes, statistiques = [], []
+    lignes_max = 1
+
+    for rotation in range(6):
+        m_a, e_a = passages_rotation(stats_a, rotation)
+        pos_a = obtenir_rotation_positions(base_a, rotation, doit_tourner=False)
+        pos_b = obtenir_rotation_positions(base_b, rotation, doit_tourner=False)
+        for serveur, marques, encaisses, couleurs in (('A', m_a, e_a, (COULEUR_A, 'salmon')),
+                                                      ('B', e_a, m_a, (COULEUR_B, COULEUR_A))):
+            cellule = {'rotation': f"Rotation {ROMAINS[rotation]}", 'service': serveur}
+            textes.extend({**cellule, **texte} for texte in _textes_terrain(pos_a, pos_b, serveur))
+            tm, te, td, tot_m, tot_e = format_stats(marques, encaisses)
+            for x, entete, corps, total, couleur in ((1, "pts marqués", tm, tot_m, couleurs[0]),
+                                                     (7, "pts encaissés", te, tot_e, couleurs[1]),
+                                                     (13, "différence", td, f"{tot_m - tot_e:+d}", 'black')):
+                lignes = [entete, *corps.split("\n"), "", f"Total: {total}"]
+                lignes_max = max(lignes_max, len(lignes))
+                statistiques.append({**cellule, 'x': x, 'lignes': lignes, 'couleur': couleur})
+
+    # Hauteur d'une ligne de texte en unités du terrain (9 m de large pour ~120 px)
+    interligne = 0.9
+    bas = -1.5 - interligne * lignes_max
+    echelle_x = {'domain': [-3, 21]}
+    echelle_y = {'domain': [bas, 10]}
+    couleur = {'field': 'couleur', 'type': 'nominal', 'scale': None}
+    # Une seule source facettée : chaque couche filtre ses lignes selon leur genre
+    terrains = [{'rotation': f"Rotation {r}", 'service': s, 'genre': 'terrain'} for r in ROMAINS for s in 'AB']
+    valeurs = (terrains + [{**t, 'genre': 'joueur'} for t in textes]
+               + [{**t, 'genre': 'statistique'} for t in statistiques])
+
+    def couche(genre: str, mark: dict, encoding: dict) -> dict:
+        return {'transform': [{'filter': f"datum.genre == '{genre}'"}], 'mark': mark, 'encoding': encoding}
+
+    return {
+        '$schema': 'https://vega.github.io/schema/vega-lite/v5.json',
+        'data': {'values': valeurs},
+        'facet': {'row': {'field': 'rotation', 'type': 'nominal', 'sort': [f"Rotation {r}" for r in ROMAINS],
+                          'header': {'title': None, 'labelFontWeight': 'bold', 'labelFontSize': 14}},
+                  'column': {'field': 'service', 'type': 'nominal', 'header': None}},
+        'spec': {
+            'width': 440, 'height': int(15 * (10 - bas)),
+            'layer': [
+                # Terrain et filet
+                couche('terrain', {'type': 'rect', 'fill': '#fafafa', 'stroke': 'black', 'strokeWidth': 2},
+                       {'x': {'datum': 0, 'type': 'quantitative', 'scale': echelle_x, 'axis': None}, 'x2': {'datum': 18},
+                        'y': {'datum': 0, 'type': 'quantitative', 'scale': echelle_y, 'axis': None}, 'y2': {'datum': 9}}),
+                couche('terrain', {'type': 'rule', 'strokeWidth': 3, 'color': 'black'},
+                       {'x': {'datum': 9, 'type': 'quantitative'}, 'y': {'datum': 0, 'type': 'quantitative'},
+                        'y2': {'datum': 9}}),
+                # Joueurs
+                couche('joueur', {'type': 'text', 'fontSize': 20, 'fontWeight': 'bold'},
+                       {'x': {'field': 'x', 'type': 'quantitative'}, 'y': {'field': 'y', 'type': 'quantitative'},
+                        'text': {'field': 'texte'}, 'color': couleur}),
+                # Points par passage, sous le terrain
+                couche('statistique', {'type': 'text', 'align': 'left', 'baseline': 'top', 'font': 'monospace',
+                                       'lineHeight': 14},
+                       {'x': {'field': 'x', 'type': 'quantitative'}, 'y': {'datum': -1.5, 'type': 'quantitative'},
+                        'text': {'field': 'lignes'}, 'color': couleur}),
+            ],
+        },
+        'config': {'view': {'stroke': None}},
+    }